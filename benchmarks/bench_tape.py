@@ -0,0 +1,40 @@
+"""
+Measures the cost of a single tape write depending on the tape size.
+
+Run as ``python benchmarks/bench_tape.py``.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from turing_machine.tape import Tape  # noqa: E402
+from turing_machine.constants import LAMBDA  # noqa: E402
+
+
+def bench_writes(size: int, repeat: int = 10000) -> float:
+    """Returns average time (in seconds) of a write/erase pair at the tape bounds.
+
+    :param size: how many cells are written on the tape
+    :param repeat: how many write/erase pairs to time
+    """
+    tape = Tape('a' * size)
+
+    def step():
+        tape[size] = 'b'
+        tape[size] = LAMBDA
+        tape[-1] = 'b'
+        tape[-1] = LAMBDA
+
+    return timeit.timeit(step, number=repeat) / (4 * repeat)
+
+
+def main():
+    print("%10s | %12s" % ("cells", "ns per write"))
+    for size in (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6):
+        print("%10d | %12.1f" % (size, bench_writes(size) * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Generated Turing machines used by the benchmark suite.
+
+Every generator returns a machine config (keyword arguments of
+:class:`~turing_machine.turing_machine.TuringMachine`).
+"""
+from turing_machine.constants import LAMBDA
+
+
+def unary_counter(length: int = 0) -> dict:
+    """Appends a 1 to a unary number forever, walking to its end and back every time."""
+    return {
+        'alphabet': '1',
+        'tape': '1' * length,
+        'rules': {
+            "right": {
+                "1": ["1", "R", "right"],
+                LAMBDA: ["1", "L", "left"]
+            },
+            "left": {
+                "1": ["1", "L", "left"],
+                LAMBDA: [LAMBDA, "R", "right"]
+            }
+        },
+        'initial_state': "right"
+    }
+
+
+def binary_counter(bits: str = '0') -> dict:
+    """Increments a binary number forever."""
+    return {
+        'alphabet': '01',
+        'tape': bits,
+        'rules': {
+            "end": {
+                "0": ["0", "R", "end"],
+                "1": ["1", "R", "end"],
+                LAMBDA: [LAMBDA, "L", "add"]
+            },
+            "add": {
+                "0": ["1", "L", "start"],
+                "1": ["0", "L", "add"],
+                LAMBDA: ["1", "N", "start"]
+            },
+            "start": {
+                "0": ["0", "L", "start"],
+                "1": ["1", "L", "start"],
+                LAMBDA: [LAMBDA, "R", "end"]
+            }
+        },
+        'initial_state': "end"
+    }
+
+
+def busy_beaver() -> dict:
+    """The 5-state busy beaver champion of Marxen and Buntrock, halts after 47176870 tacts."""
+    table = {
+        "A": ("1RB", "1LC"),
+        "B": ("1RC", "1RB"),
+        "C": ("1RD", "0LE"),
+        "D": ("1LA", "1LD"),
+        "E": ("1R!", "0LA"),
+    }
+
+    def rule(action):
+        return [LAMBDA if action[0] == '0' else '1', action[1], action[2]]
+
+    return {
+        'alphabet': '1',
+        'tape': '',
+        'rules': {q: {LAMBDA: rule(zero), "1": rule(one)} for q, (zero, one) in table.items()},
+        'initial_state': "A"
+    }
+
+
+def long_sweep(length: int) -> dict:
+    """Inverts a long word going back and forth over it forever."""
+    return {
+        'alphabet': 'ab',
+        'tape': 'ab' * (length // 2),
+        'rules': {
+            "right": {
+                "a": ["b", "R", "right"],
+                "b": ["a", "R", "right"],
+                LAMBDA: [LAMBDA, "L", "left"]
+            },
+            "left": {
+                "a": ["b", "L", "left"],
+                "b": ["a", "L", "left"],
+                LAMBDA: [LAMBDA, "R", "right"]
+            }
+        },
+        'initial_state': "right"
+    }
+
+
+def wide_alphabet(size: int, length: int = 100) -> dict:
+    """Shifts every character of a word to the next one of a `size`-character alphabet, going back and forth forever."""
+    alphabet = ''.join(chr(0x100 + i) for i in range(size))
+    following = {c: alphabet[(i + 1) % size] for i, c in enumerate(alphabet)}
+    return {
+        'alphabet': alphabet,
+        'tape': (alphabet * (length // size + 1))[:length],
+        'rules': {
+            "right": dict({c: [following[c], "R", "right"] for c in alphabet}, **{LAMBDA: [LAMBDA, "L", "left"]}),
+            "left": dict({c: [c, "L", "left"] for c in alphabet}, **{LAMBDA: [LAMBDA, "R", "right"]})
+        },
+        'initial_state': "right"
+    }
+
+
+CORPUS = {
+    "unary_counter": (unary_counter(), 2000000),
+    "binary_counter": (binary_counter(), 2000000),
+    "busy_beaver_5": (busy_beaver(), 2000000),
+    "long_sweep": (long_sweep(100000), 2000000),
+    "wide_alphabet": (wide_alphabet(200), 2000000),
+}
+"""Maps benchmark name to machine config and tacts limit."""
@@ -0,0 +1,162 @@
+"""
+Load test of the web viewer: requests/s and latencies under concurrent users.
+
+Starts the viewer in production mode on a free port (or uses a running one
+given by ``--url``). Every user uploads machines of its own, each one
+different from all the others, and requests their pages and runs, so every
+request misses the result cache and every run takes a worker process::
+
+    python benchmarks/load_test.py --users 16 --seconds 20 --workers 2
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from corpus import binary_counter  # noqa: E402
+
+KINDS = ('upload', 'view-machine', 'first-steps', 'machine-steps')
+"""Kinds of requests timed: first-steps is the time to the first line of a run, machine-steps to its end."""
+
+
+def unique_machine(number: int) -> dict:
+    """Returns a binary counter starting from the number, so that machines of different numbers differ."""
+    return binary_counter(format(number, 'b'))
+
+
+def free_port() -> int:
+    """Returns a port nobody listens to."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def upload(url: str, filename: str, config: dict):
+    """Uploads the machine by the viewer form."""
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/json\r\n\r\n{json.dumps(config)}\r\n--{boundary}--\r\n'
+    ).encode()
+    request = urllib.request.Request(url + '/', body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    urllib.request.urlopen(request).read()
+
+
+def wait_for(url: str, seconds: float = 30):
+    """Waits for the server to start responding."""
+    deadline = time.monotonic() + seconds
+    while True:
+        try:
+            urllib.request.urlopen(url + '/').read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def user(url: str, deadline: float, number: int, users: int, latencies: dict, errors: list, busy: list):
+    """Uploads machines, requests their pages and runs till the deadline.
+
+    Runs the server turns down for all its workers being busy are counted in `busy`, not in `errors`.
+    """
+    i = 0
+    while time.monotonic() < deadline:
+        machine = number + users * i
+        filename = f'machine{machine}.json'
+        try:
+            start = time.monotonic()
+            upload(url, filename, unique_machine(machine))
+            latencies['upload'].append(time.monotonic() - start)
+
+            start = time.monotonic()
+            urllib.request.urlopen(f'{url}/view-machine/{filename}').read()
+            latencies['view-machine'].append(time.monotonic() - start)
+
+            start = time.monotonic()
+            with urllib.request.urlopen(f'{url}/machine-steps/{filename}') as response:
+                response.readline()
+                latencies['first-steps'].append(time.monotonic() - start)
+                response.read()
+            latencies['machine-steps'].append(time.monotonic() - start)
+        except urllib.error.HTTPError as e:
+            (busy if e.code == 503 else errors).append(str(e))
+        except (urllib.error.URLError, ConnectionError) as e:
+            errors.append(str(e))
+        i += 1
+
+
+def percentiles(latencies: list) -> dict:
+    """Returns median and 95th percentile of the latencies in milliseconds."""
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "median_ms": 1000 * latencies[len(latencies) // 2] if latencies else None,
+        "p95_ms": 1000 * latencies[int(len(latencies) * 0.95)] if latencies else None
+    }
+
+
+def load(url: str, users: int, seconds: float) -> dict:
+    """Runs the load test, returns its results."""
+    latencies, errors, busy = {kind: [] for kind in KINDS}, [], []
+    deadline = time.monotonic() + seconds
+    threads = [threading.Thread(target=user, args=(url, deadline, number, users, latencies, errors, busy)) for number in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    requests = sum(len(latencies[kind]) for kind in ('upload', 'view-machine', 'machine-steps'))
+    return {
+        "users": users,
+        "requests": requests,
+        "errors": len(errors),
+        "busy": len(busy),
+        "requests_per_second": requests / seconds,
+        "runs_per_second": len(latencies['machine-steps']) / seconds,
+        "latencies": {kind: percentiles(latencies[kind]) for kind in KINDS}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Turing machine web viewer load test.')
+    parser.add_argument('--url', help='viewer to test, started in production mode by default')
+    parser.add_argument('--users', type=int, default=16, help='concurrent users')
+    parser.add_argument('--seconds', type=float, default=20, help='test duration')
+    parser.add_argument('--threads', type=int, default=8, help='server threads')
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes')
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    uploads = tempfile.TemporaryDirectory()
+    if url is None:
+        port = free_port()
+        url = f'http://127.0.0.1:{port}'
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'turing_machine', 'web', '--production', '--host', '127.0.0.1', '--port', str(port),
+             '--threads', str(args.threads), '--workers', str(args.workers), '--upload-folder', uploads.name],
+            cwd=os.path.join(os.path.dirname(__file__), '..')
+        )
+    try:
+        wait_for(url)
+        print(json.dumps(load(url, args.users, args.seconds), indent=4))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        uploads.cleanup()
+
+
+if __name__ == '__main__':
+    main()
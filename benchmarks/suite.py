@@ -0,0 +1,193 @@
+"""
+Performance suite for the machine engine, the tape and the web viewer.
+
+Every benchmark runs in a fresh process, so peak RSS is measured per case.
+Results are saved as JSON to be compared between commits::
+
+    python benchmarks/suite.py run -o before.json
+    python benchmarks/suite.py run -o after.json
+    python benchmarks/suite.py compare before.json after.json
+"""
+import argparse
+import gettext
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from turing_machine.turing_machine import TuringMachine  # noqa: E402
+from turing_machine.constants import NORMAL_MODE, BY_STEP_MODE, ACCELERATED_MODE, MAX_ITERATIONS, DICT_TAPE  # noqa: E402
+from turing_machine.tape import TAPE_ENGINES  # noqa: E402
+from corpus import CORPUS  # noqa: E402
+
+BY_STEP_TACTS = 200000
+"""Tacts limit for runs saving every step, which take memory proportional to tacts."""
+WEB = "web"
+"""Name of the web viewer rendering benchmark mode."""
+LIMITS = "limits"
+"""Name of the benchmark mode running in normal mode with time and tape limits checked."""
+MODES = (NORMAL_MODE, ACCELERATED_MODE, BY_STEP_MODE, LIMITS, WEB)
+
+
+def run_machine(config: dict, mode: str, max_tacts: int) -> int:
+    """Runs the machine, returns number of tacts done."""
+    machine = TuringMachine(**config)
+    return machine.run(mode, max_tacts=max_tacts)["iterations"]
+
+
+def run_limited(config: dict, mode: str, max_tacts: int) -> int:
+    """Runs the machine with time and tape limits it never reaches, returns number of tacts done."""
+    machine = TuringMachine(**config)
+    return machine.run(NORMAL_MODE, max_tacts=max_tacts, deadline=time.monotonic() + 3600, max_cells=2 ** 62)["iterations"]
+
+
+def render_web(config: dict, mode: str, max_tacts: int) -> int:
+    """Renders the machine by the web viewer and streams its steps, returns number of tacts it runs.
+
+    The result cache of the viewer is cleared first, so that the machine is run every time.
+    """
+    import turing_machine.web as web
+
+    web.results.clear()
+    path = os.path.dirname(web.__file__)
+    gettext.install('turing_machine', localedir=path)
+    with tempfile.TemporaryDirectory() as upload:
+        web.app.config['JS_FOLDER'] = path + '/web/js'
+        web.app.config['CSS_FOLDER'] = path + '/web/css'
+        web.app.config['UPLOAD_FOLDER'] = upload
+        with open(os.path.join(upload, 'machine.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+        client = web.app.test_client()
+        for url in ('/view-machine/machine.json', '/machine-steps/machine.json'):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f'web viewer responded with {response.status_code}')
+    return json.loads(response.get_data(as_text=True).splitlines()[-1])["result"]["iterations"]
+
+
+def measure(name: str, mode: str, tape_engine: str) -> dict:
+    """Measures one benchmark case, meant to be run in a fresh process."""
+    config, max_tacts = CORPUS[name]
+    config = dict(config, tape_engine=tape_engine)
+    function = run_machine
+    if mode == BY_STEP_MODE:
+        max_tacts = min(max_tacts, BY_STEP_TACTS)
+    elif mode == LIMITS:
+        function = run_limited
+    elif mode == WEB:
+        max_tacts = MAX_ITERATIONS
+        function = render_web
+
+    start = time.perf_counter()
+    tacts = function(config, mode, max_tacts)
+    seconds = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    function(config, mode, max_tacts)
+    allocated_blocks = sys.getallocatedblocks() - blocks
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "case": name,
+        "mode": mode,
+        "tape_engine": tape_engine,
+        "tacts": tacts,
+        "seconds": seconds,
+        "tacts_per_second": tacts / seconds if seconds else None,
+        "peak_rss_kb": peak_rss,
+        "peak_traced_kb": peak_traced // 1024,
+        "allocated_blocks": allocated_blocks
+    }
+
+
+def git_commit() -> str:
+    """Returns hash of the current commit, None if it's unknown."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases, modes, tape_engines, output: str):
+    """Runs the benchmarks and saves their results."""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for name in cases:
+            for mode in modes:
+                for tape_engine in tape_engines:
+                    result = pool.apply(measure, (name, mode, tape_engine))
+                    results.append(result)
+                    print("%16s | %11s | %10s | %10d tacts | %12.0f tacts/s | %8d KB RSS" % (
+                        name, mode, tape_engine, result["tacts"], result["tacts_per_second"] or 0, result["peak_rss_kb"]
+                    ))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+
+def compare(before: str, after: str):
+    """Prints change of tacts/s and memory between two saved results."""
+    def key(result):
+        return result["case"], result["mode"], result.get("tape_engine", DICT_TAPE)
+
+    with open(before, encoding='utf-8') as f:
+        old = {key(r): r for r in json.load(f)["results"]}
+    with open(after, encoding='utf-8') as f:
+        new = {key(r): r for r in json.load(f)["results"]}
+
+    print("%16s | %11s | %10s | %10s | %10s | %10s" % ("case", "mode", "tape", "tacts/s", "RSS", "traced"))
+    for case in [case for case in new if case in old]:
+        a, b = old[case], new[case]
+        print("%16s | %11s | %10s | %9.2fx | %9.2fx | %9.2fx" % (
+            *case,
+            (b["tacts_per_second"] or 0) / (a["tacts_per_second"] or 1),
+            b["peak_rss_kb"] / max(a["peak_rss_kb"], 1),
+            b["peak_traced_kb"] / max(a["peak_traced_kb"], 1)
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Turing machine emulator benchmarks.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    runner = commands.add_parser('run', help='run benchmarks')
+    runner.add_argument('-o', '--output', help='JSON file to save results to')
+    runner.add_argument('--case', action='append', choices=CORPUS, help='benchmark to run, all by default')
+    runner.add_argument('--mode', action='append', choices=MODES, help='mode to run in, all by default')
+    runner.add_argument('--tape-engine', action='append', choices=TAPE_ENGINES, help='tape engine to use, all by default')
+
+    comparer = commands.add_parser('compare', help='compare two saved results')
+    comparer.add_argument('before')
+    comparer.add_argument('after')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run(args.case or list(CORPUS), args.mode or MODES, args.tape_engine or list(TAPE_ENGINES), args.output)
+    else:
+        compare(args.before, args.after)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest import mock
+
+import test_tape
+from turing_machine.tape import ArrayTape
+from turing_machine.constants import LAMBDA
+
+
+class TestArrayTape(test_tape.TestTape):
+    """Runs all the tape tests against the array-backed engine."""
+    def setUp(self):
+        patcher = mock.patch.object(test_tape, 'Tape', ArrayTape)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_growth(self):
+        tape = ArrayTape('ab')
+        for i in range(1, 1000):
+            tape[-i] = 'x'
+            tape[i + 1] = 'y'
+
+        self.assertEqual(str(tape), 'x' * 999 + 'ab' + 'y' * 999)
+        self.assertEqual(tape[-999], 'x')
+        self.assertEqual(tape[-1000], LAMBDA)
+        self.assertEqual(tape[1001], LAMBDA)
+
+    def test_many_symbols(self):
+        symbols = ''.join(chr(ord('A') + i) for i in range(300))
+        tape = ArrayTape(symbols)
+        tape[-1] = 'A'
+        self.assertEqual(str(tape), 'A' + symbols)
+
+    def test_filter(self):
+        tape = ArrayTape('abcab')
+        tape.filter('b' + LAMBDA)
+        self.assertEqual(str(tape), 'b' + LAMBDA + LAMBDA + 'b')
+        tape.filter(LAMBDA)
+        self.assertEqual(str(tape), '')
+
+    def test_fingerprint_engines(self):
+        self.assertEqual(ArrayTape('ab' + LAMBDA + 'c', -3).fingerprint(), test_tape.Tape('ab' + LAMBDA + 'c', -3).fingerprint())
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tape')
+            with open(path, 'wb') as f:
+                f.write(b'\x00ab\x00c\x00\x00')
+
+            tape = ArrayTape.load(path, -2)
+            self.assertEqual(tape.bounds, (-1, 3))
+            self.assertEqual(str(tape), 'ab' + LAMBDA + 'c')
+            tape[0] = 'x'
+            tape[-1] = LAMBDA
+            self.assertEqual(str(tape), 'x' + LAMBDA + 'c')
+            fork = tape.fork()
+            tape[10] = 'y'
+            tape[-5] = 'z'
+            self.assertEqual(str(tape), 'z' + LAMBDA * 4 + 'x' + LAMBDA + 'c' + LAMBDA * 7 + 'y')
+            self.assertEqual(str(fork), 'x' + LAMBDA + 'c')
+            tape[1] = 'λ'
+            tape[2] = 'Ā'
+            self.assertEqual(tape.slice(0, 3), 'x' + LAMBDA + 'Ā')
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'\x00ab\x00c\x00\x00')
+
+            with open(path, 'wb') as f:
+                f.write(b'\x00' * 10)
+            self.assertEqual(str(ArrayTape.load(path)), '')
+            open(path, 'wb').close()
+            self.assertEqual(str(ArrayTape.load(path)), '')
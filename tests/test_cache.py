@@ -0,0 +1,35 @@
+import unittest
+
+from turing_machine.cache import ResultCache, machine_key
+
+
+class TestCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = ResultCache(10)
+        cache.put('a', 'xxxx')
+        cache.put('b', ['xx', 'xx'])
+        cache.put('c', 'xx')
+        self.assertEqual(cache.size, 10)
+
+        self.assertEqual(cache.get('a'), 'xxxx')
+        cache.put('d', 'xxx')
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('b', 'missing'), 'missing')
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.size, 9)
+
+        cache.put('e', 'x' * 11)
+        self.assertNotIn('e', cache)
+        cache.put('a', 'x')
+        self.assertEqual(cache.size, 6)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_machine_key(self):
+        config = {'alphabet': 'ab', 'tape': 'ab', 'rules': {"q0": {"a": ["b", "R", "q0"]}}}
+        self.assertEqual(machine_key(config, 10), machine_key(dict(config), 10))
+        self.assertNotEqual(machine_key(config, 10), machine_key(config, 11))
+        self.assertNotEqual(machine_key(config, 10), machine_key(dict(config, tape='ba'), 10))
+        self.assertNotEqual(machine_key(config, 10), machine_key(dict(config, position=1), 10))
@@ -0,0 +1,55 @@
+import unittest
+
+from turing_machine.compiler import CompiledRules, parse_rule
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        self.rules = {
+            "q0": {"a": ["b", "R", "q1"], "b": ["c", "X", "q0"]},
+            "q1": {"a": ["a", "L", "q2"], "b": ["b", "N", "!"], "λ": ["λ", "N", "q1"]},
+        }
+
+    def test_problems(self):
+        compiled = CompiledRules("abλ", self.rules)
+        self.assertEqual(compiled.problems("q0"), [
+            "state q0 has no rules for λ",
+            "rules use characters out of the alphabet: c",
+            "rules go to states with no rules: q2",
+            "state q0 has unknown move X for b",
+        ])
+        self.assertEqual(compiled.reachable("q0"), {"q0", "q1", "q2", "!"})
+        self.assertIn("state ! is unreachable from q2", compiled.problems("q2"))
+        self.assertIn("initial state q3 has no rules", compiled.problems("q3"))
+
+    def test_malformed(self):
+        self.rules["q0"]["λ"] = ["λ", "N"]
+        self.rules["q1"]["a"] = None
+        compiled = CompiledRules("abλ", self.rules)
+        self.assertEqual(compiled.malformed, (("q0", "λ"), ("q1", "a")))
+        self.assertIsNone(compiled.rule("q0", "λ"))
+        self.assertEqual(compiled.problems("q0")[:2], [
+            "state q0 has malformed rule for λ",
+            "state q1 has malformed rule for a",
+        ])
+
+    def test_immutable(self):
+        compiled = CompiledRules("abλ", self.rules)
+        self.assertEqual(compiled, CompiledRules("abλ", self.rules))
+        self.assertEqual(len({compiled, CompiledRules("abλ", self.rules)}), 1)
+        self.assertNotEqual(compiled, CompiledRules("abcλ", self.rules))
+        with self.assertRaises(AttributeError):
+            compiled.width = 1
+        with self.assertRaises(TypeError):
+            compiled.symbol_codes["d"] = 5
+
+        self.assertEqual(compiled.rule("q1", "a"), (0, -1, compiled.state_codes["q2"] * compiled.width))
+        self.assertIsNone(compiled.rule("q0", "λ"))
+        self.assertIsNone(compiled.rule("q2", "a"))
+
+    def test_parse_rule(self):
+        self.assertEqual(parse_rule("a R q1", "abλ", self.rules), ["a", "R", "q1"])
+        self.assertEqual(parse_rule(" λ,l, !", "abλ", self.rules), ["λ", "L", "!"])
+        for text in ("a R", "c R q1", "a X q1", "a R q5", "ab R q1"):
+            with self.assertRaises(ValueError):
+                parse_rule(text, "abλ", self.rules)
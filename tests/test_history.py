@@ -0,0 +1,99 @@
+import unittest
+
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.history import History
+from turing_machine.constants import LAMBDA, STOP_STATE
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        # increments a binary number forever
+        self.config = {
+            'alphabet': '01',
+            'tape': '0',
+            'rules': {
+                "end": {"0": ["0", "R", "end"], "1": ["1", "R", "end"], LAMBDA: [LAMBDA, "L", "add"]},
+                "add": {"0": ["1", "L", "start"], "1": ["0", "L", "add"], LAMBDA: ["1", "N", "start"]},
+                "start": {"0": ["0", "L", "start"], "1": ["1", "L", "start"], LAMBDA: [LAMBDA, "R", "end"]},
+            },
+            'initial_state': "end"
+        }
+
+    def configurations(self, tacts: int) -> list:
+        """Returns snapshots of the machine at every tact up to `tacts`."""
+        machine = TuringMachine(**self.config)
+        snapshots = [machine.snapshot()]
+        for _ in range(tacts):
+            machine.run(max_tacts=1)
+            snapshots.append(machine.snapshot())
+        return snapshots
+
+    def test_step_back(self):
+        expected = self.configurations(300)
+        machine = TuringMachine(**self.config)
+        history = History(machine, checkpoint_tacts=16)
+        machine.run(max_tacts=300, history=history)
+        for tact in range(300, 0, -1):
+            self.assertEqual(machine.snapshot(), expected[tact])
+            self.assertTrue(history.step_back())
+        self.assertEqual(machine.snapshot(), expected[0])
+        self.assertFalse(history.step_back())
+
+        machine.run(max_tacts=10, history=history)
+        self.assertEqual(machine.snapshot(), expected[10])
+
+    def test_seek(self):
+        expected = self.configurations(1000)
+        machine = TuringMachine(**self.config)
+        history = History(machine, checkpoint_tacts=50)
+        machine.run(max_tacts=500, history=history)
+        for tact in (490, 120, 121, 999, 0, 700, 700, 333, 1000):
+            history.seek(tact)
+            self.assertEqual(machine.snapshot(), expected[tact], tact)
+            self.assertEqual(history.start + len(history.undo), tact)
+        self.assertLessEqual(len(history.checkpoints), 1000 // 50 + 1)
+
+    def test_budget(self):
+        expected = self.configurations(1000)
+        machine = TuringMachine(**self.config)
+        history = History(machine, checkpoint_tacts=64, budget=100)
+        machine.run(max_tacts=1000, history=history)
+        self.assertEqual(len(history.undo), 100)
+        self.assertEqual(history.start, 900)
+        self.assertLessEqual(len(history.checkpoints), 2)
+
+        history.seek(901)
+        self.assertEqual(machine.snapshot(), expected[901])
+        with self.assertRaises(ValueError):
+            history.seek(899)
+
+    def test_checkpoint_cells(self):
+        expected = self.configurations(1000)
+        machine = TuringMachine(**self.config)
+        history = History(machine, checkpoint_tacts=10, checkpoint_cells=50)
+        machine.run(max_tacts=1000, history=history)
+        self.assertLessEqual(sum(len(snapshot.tape) for snapshot in history.checkpoints), 50)
+        self.assertEqual(history.cells, sum(len(snapshot.tape) for snapshot in history.checkpoints))
+        self.assertEqual(len(history.undo), 1000)
+
+        for tact in (995, 10, 0):
+            history.seek(tact)
+            self.assertEqual(machine.snapshot(), expected[tact], tact)
+
+    def test_stop(self):
+        machine = TuringMachine(alphabet="a", tape="aa", rules={"q0": {"a": [LAMBDA, "R", "q0"], LAMBDA: [LAMBDA, "N", STOP_STATE]}})
+        history = History(machine)
+        history.seek(100)
+        self.assertEqual(machine.tacts, 3)
+        self.assertEqual(machine.get_tape_string(), "")
+        history.seek(1)
+        self.assertEqual(machine.get_tape_string(), "a")
+        self.assertEqual((machine.position, machine.state), (1, "q0"))
+
+        machine.tape[5] = "a"
+        history.clear()
+        history.seek(3)
+        history.seek(1)
+        self.assertEqual(machine.get_tape_string(), "a" + LAMBDA * 3 + "a")
+        with self.assertRaises(ValueError):
+            history.seek(0)
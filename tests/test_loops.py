@@ -0,0 +1,94 @@
+import unittest
+
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.constants import BY_STEP_MODE, LOOP_DETECTED_STATUS, MAX_ITERATIONS_REACHED_STATUS, SUCCESSFUL_STATUS
+
+
+class TestLoops(unittest.TestCase):
+    @staticmethod
+    def brute_force(config, max_tacts):
+        """Returns loop start and period found by remembering all the configurations."""
+        machine = TuringMachine(**config)
+        seen = {}
+        for tact in range(max_tacts):
+            configuration = machine.snapshot()._replace(tacts=0)
+            if configuration in seen:
+                return seen[configuration], tact - seen[configuration]
+            seen[configuration] = tact
+            machine.run(max_tacts=1)
+
+    def test_oscillation(self):
+        config = {
+            'alphabet': 'a',
+            'tape': 'aaaa',
+            'rules': {
+                "q0": {"a": ["a", "R", "q0"], "λ": ["λ", "L", "q1"]},
+                "q1": {"a": ["a", "R", "q2"], "λ": ["λ", "N", "!"]},
+                "q2": {"a": ["a", "N", "!"], "λ": ["λ", "L", "q1"]},
+            }
+        }
+
+        machine = TuringMachine(**config)
+        result = machine.run(detect_loops=True)
+        self.assertEqual(result["status"], LOOP_DETECTED_STATUS)
+        self.assertEqual(result["loop_start"], 5)
+        self.assertEqual(result["loop_period"], 2)
+        self.assertEqual(result["iterations"], 7)
+        self.assertEqual(machine.state, "q1")
+
+        steps = TuringMachine(**config).run(BY_STEP_MODE, detect_loops=True)["steps"]
+        self.assertEqual(len(steps), 7)
+
+    def test_long_prefix_small_memory(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'ab' * 20,
+            'rules': {
+                "q0": {"a": ["b", "R", "q0"], "b": ["a", "R", "q0"], "λ": ["a", "L", "q1"]},
+                "q1": {"a": ["b", "L", "q1"], "b": ["b", "L", "q1"], "λ": ["λ", "R", "q2"]},
+                "q2": {"a": ["a", "R", "q3"], "b": ["a", "R", "q3"], "λ": ["λ", "N", "!"]},
+                "q3": {"a": ["a", "L", "q2"], "b": ["b", "L", "q2"], "λ": ["λ", "N", "!"]},
+            }
+        }
+
+        loop_start, loop_period = self.brute_force(config, 1000)
+        result = TuringMachine(**config).run(detect_loops=True, loop_memory=4)
+        self.assertEqual(result["status"], LOOP_DETECTED_STATUS)
+        self.assertEqual(result["loop_start"], loop_start)
+        self.assertEqual(result["loop_period"], loop_period)
+
+    def test_smallest_memory(self):
+        config = {
+            'alphabet': 'a',
+            'tape': 'a',
+            'rules': {
+                "q0": {"a": ["a", "R", "q1"]},
+                "q1": {"λ": ["λ", "N", "q1"]},
+            }
+        }
+
+        for loop_memory in (0, 1, 2):
+            result = TuringMachine(**config).run(detect_loops=True, loop_memory=loop_memory)
+            self.assertEqual(result["status"], LOOP_DETECTED_STATUS)
+            self.assertEqual(result["loop_start"], 1)
+            self.assertEqual(result["loop_period"], 1)
+            self.assertEqual(result["iterations"], 2)
+
+    def test_no_loop(self):
+        config = {
+            'alphabet': 'a',
+            'tape': 'aa',
+            'rules': {
+                "q0": {"a": ["a", "R", "q0"], "λ": ["a", "R", "q0"]},
+            }
+        }
+
+        result = TuringMachine(**config).run(max_tacts=500, detect_loops=True, loop_memory=8)
+        self.assertEqual(result["status"], MAX_ITERATIONS_REACHED_STATUS)
+        self.assertEqual(result["iterations"], 500)
+        self.assertNotIn("loop_start", result)
+
+        config["rules"]["q0"]["λ"] = ["λ", "N", "!"]
+        result = TuringMachine(**config).run(detect_loops=True)
+        self.assertEqual(result["status"], SUCCESSFUL_STATUS)
+        self.assertEqual(result["iterations"], 3)
@@ -0,0 +1,80 @@
+import unittest
+
+from turing_machine.multitape import MultiTapeMachine
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.constants import BY_STEP_MODE, SUCCESSFUL_STATUS, ARRAY_TAPE
+
+
+class TestMultiTape(unittest.TestCase):
+    def setUp(self):
+        # copies the word to the second tape, rewinds the first one and compares them in opposite directions,
+        # stops on the end of the word if it's a palindrome
+        self.palindrome = {
+            'alphabet': 'ab',
+            'rules': {
+                "copy": {
+                    "aλ": ["aa", "RR", "copy"],
+                    "bλ": ["bb", "RR", "copy"],
+                    "λλ": ["λλ", "LL", "rewind"],
+                },
+                "rewind": {
+                    "aa": ["aa", "LN", "rewind"],
+                    "ab": ["ab", "LN", "rewind"],
+                    "ba": ["ba", "LN", "rewind"],
+                    "bb": ["bb", "LN", "rewind"],
+                    "λa": ["λa", "RN", "compare"],
+                    "λb": ["λb", "RN", "compare"],
+                    "λλ": ["λλ", "NN", "!"],
+                },
+                "compare": {
+                    "aa": ["aa", "RL", "compare"],
+                    "bb": ["bb", "RL", "compare"],
+                    "ab": ["ab", "NN", "!"],
+                    "ba": ["ba", "NN", "!"],
+                    "λλ": ["λλ", "NN", "!"],
+                },
+            },
+            'initial_state': "copy"
+        }
+
+    def test_palindrome(self):
+        for word, accepted in (("abba", True), ("abab", False), ("a" * 50 + "b" + "a" * 50, True), ("", True)):
+            machine = MultiTapeMachine(tapes=(word, ''), **self.palindrome)
+            result = machine.run(max_tacts=1000)
+            self.assertEqual(machine.tapes[0][machine.positions[0]] == "λ", accepted, word)
+            self.assertLessEqual(result["iterations"], 3 * len(word) + 3)
+            self.assertEqual(result["results"], [word, word])
+
+    def test_result_format(self):
+        machine = MultiTapeMachine(tapes=("ab", ''), **self.palindrome)
+        result = machine.run(BY_STEP_MODE)
+        self.assertEqual(result["status"], SUCCESSFUL_STATUS)
+        self.assertEqual(result["result"], "ab")
+        self.assertEqual(result["head_position"], machine.positions[0])
+        self.assertEqual(result["head_positions"], [0, 1])
+        self.assertLessEqual(set(TuringMachine(alphabet="a", rules={"q0": {}}, initial_state="!").run(BY_STEP_MODE)), set(result))
+        self.assertEqual(result["steps"][0], {
+            "curr_state": "copy", "next_state": "copy", "curr_character": "aλ",
+            "next_character": "aa", "move": "RR", "tact": 0
+        })
+        self.assertEqual(len(result["steps"]), result["iterations"])
+
+    def test_array_tapes(self):
+        machine = MultiTapeMachine(tapes=("abba", ''), tape_engine=ARRAY_TAPE, **self.palindrome)
+        machine.run()
+        self.assertEqual(machine.state, "!")
+        self.assertEqual(machine.get_tape_strings(), ["abba", "abba"])
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            MultiTapeMachine(alphabet='a', rules={"q0": {"a": ["aa", "RR", "q0"]}}, tapes=('a', 'a'))
+        with self.assertRaises(ValueError):
+            MultiTapeMachine(alphabet='a', rules={"q0": {"aa": ["aa", "RX", "q0"]}}, tapes=('a', 'a'))
+        with self.assertRaises(ValueError):
+            MultiTapeMachine(alphabet='a', rules={}, tapes=('a', 'a'), positions=[0])
+
+        machine = MultiTapeMachine(alphabet='a', rules={"q0": {"aa": ["aa", "RR", "q0"]}}, tapes=('aa', 'a'))
+        with self.assertRaises(KeyError):
+            machine.run()
+        self.assertEqual(machine.positions, [1, 1])
+        self.assertEqual(machine.tacts, 1)
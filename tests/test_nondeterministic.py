@@ -0,0 +1,89 @@
+import unittest
+
+from turing_machine.nondeterministic import NondeterministicMachine
+from turing_machine.constants import ACCEPTED_STATUS, REJECTED_STATUS, FRONTIER_LIMIT_STATUS, MAX_ITERATIONS_REACHED_STATUS
+from turing_machine.constants import ARRAY_TAPE
+from turing_machine.tape import TAPE_ENGINES
+
+
+class TestNondeterministic(unittest.TestCase):
+    def setUp(self):
+        # writes any two-character word, stops if it's "bb"
+        self.guess = {
+            'alphabet': 'ab',
+            'rules': {
+                "first": {"λ": [["a", "R", "second"], ["b", "R", "second"]]},
+                "second": {"λ": [["a", "L", "check"], ["b", "L", "check"]]},
+                "check": {"b": ["b", "R", "last"]},
+                "last": {"b": ["b", "N", "!"]},
+            },
+            'initial_state': "first"
+        }
+
+    def test_accepted(self):
+        for tape_engine in TAPE_ENGINES:
+            machine = NondeterministicMachine(tape_engine=tape_engine, **self.guess)
+            result = machine.run()
+            self.assertEqual(result["status"], ACCEPTED_STATUS)
+            self.assertEqual(result["result"], "bb")
+            self.assertEqual(result["branch"], [1, 1, 0, 0])
+            self.assertEqual(result["depth"], 4)
+            self.assertEqual(result["head_position"], 1)
+            self.assertEqual(str(machine.tape), "")
+
+    def test_deterministic_rules(self):
+        machine = NondeterministicMachine(alphabet="ab", tape="ab", rules={
+            "q0": {"a": ["b", "R", "q0"], "b": ["a", "R", "q0"], "λ": ["λ", "N", "!"]}
+        })
+        result = machine.run()
+        self.assertEqual(result["status"], ACCEPTED_STATUS)
+        self.assertEqual(result["result"], "ba")
+        self.assertEqual(result["branch"], [0, 0, 0])
+
+    def test_rejected(self):
+        # goes left and right forever, repeated configurations are not explored again
+        machine = NondeterministicMachine(alphabet="a", tape="a", rules={
+            "q0": {"a": [["a", "R", "q0"], ["a", "N", "q1"]], "λ": [["λ", "L", "q0"]]},
+            "q1": {"a": ["λ", "N", "q1"]},
+        })
+        result = machine.run(max_depth=1000)
+        self.assertEqual(result["status"], REJECTED_STATUS)
+        self.assertLess(result["iterations"], 10)
+        self.assertEqual(result["result"], "a")
+        self.assertNotIn("branch", result)
+
+    def test_no_transitions(self):
+        machine = NondeterministicMachine(alphabet="a", tape="a", rules={
+            "q0": {"a": [["a", "R", "q0"], ["a", "N", "q1"]], "λ": []},
+            "q1": {"a": []},
+        })
+        result = machine.run()
+        self.assertEqual(result["status"], REJECTED_STATUS)
+        self.assertEqual(result["iterations"], 2)
+
+    def test_limits(self):
+        # writes any word forever
+        rules = {"q0": {"λ": [["a", "R", "q0"], ["b", "R", "q0"]]}}
+        result = NondeterministicMachine(alphabet="ab", rules=rules).run(max_frontier=100)
+        self.assertEqual(result["status"], FRONTIER_LIMIT_STATUS)
+        self.assertEqual(result["iterations"], 7)
+
+        result = NondeterministicMachine(alphabet="ab", rules=rules).run(max_depth=5)
+        self.assertEqual(result["status"], MAX_ITERATIONS_REACHED_STATUS)
+        self.assertEqual(result["configurations"], 63)
+
+        result = NondeterministicMachine(alphabet="ab", rules=rules).run(max_depth=5, max_seen=1)
+        self.assertEqual(result["configurations"], 63)
+
+    def test_workers(self):
+        rules = dict(self.guess["rules"], first={"λ": [["a", "R", "first"], ["b", "R", "first"], ["λ", "L", "rewind"]]})
+        rules["rewind"] = {"a": ["a", "L", "rewind"], "b": ["b", "L", "rewind"], "λ": ["λ", "R", "word"]}
+        rules["word"] = {"a": ["a", "R", "word"], "b": ["b", "R", "check"]}
+        rules["check"] = {"b": ["b", "N", "!"]}
+        config = dict(self.guess, rules=rules, tape_engine=ARRAY_TAPE)
+
+        expected = NondeterministicMachine(**config).run()
+        result = NondeterministicMachine(**config).run(workers=2, parallel_frontier=4)
+        self.assertEqual(result, expected)
+        self.assertEqual(result["status"], ACCEPTED_STATUS)
+        self.assertEqual(result["result"], "bb")
@@ -0,0 +1,50 @@
+from unittest import mock
+
+import test_tape
+from turing_machine.tape import PersistentTape, PAGE_SIZE
+from turing_machine.constants import LAMBDA
+
+
+class TestPersistentTape(test_tape.TestTape):
+    """Runs all the tape tests against the paged engine."""
+    def setUp(self):
+        patcher = mock.patch.object(test_tape, 'Tape', PersistentTape)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages(self):
+        tape = PersistentTape('ab' * PAGE_SIZE, -PAGE_SIZE // 2)
+        tape[5 * PAGE_SIZE] = 'c'
+        self.assertEqual(str(tape), 'ab' * PAGE_SIZE + LAMBDA * (3 * PAGE_SIZE + PAGE_SIZE // 2) + 'c')
+        self.assertEqual(tape._depths, [1, 1])
+        tape[-PAGE_SIZE ** 3] = 'd'
+        self.assertEqual(tape[-PAGE_SIZE ** 3], 'd')
+        self.assertEqual(tape[-PAGE_SIZE ** 3 + 1], LAMBDA)
+        self.assertEqual(tape.bounds, (-PAGE_SIZE ** 3, 5 * PAGE_SIZE + 1))
+
+    def test_fork_shares_pages(self):
+        tape = PersistentTape('a' * 10 * PAGE_SIZE)
+        forks = [tape.fork() for _ in range(100)]
+        for i, fork in enumerate(forks):
+            fork[i] = 'b'
+
+        for i, fork in enumerate(forks):
+            self.assertEqual(str(fork), 'a' * i + 'b' + 'a' * (10 * PAGE_SIZE - i - 1))
+            self.assertIs(fork._PersistentTape__page(5), tape._PersistentTape__page(5))
+            self.assertIsNot(fork._PersistentTape__page(i // PAGE_SIZE), tape._PersistentTape__page(i // PAGE_SIZE))
+        self.assertEqual(str(tape), 'a' * 10 * PAGE_SIZE)
+
+        tape[0] = 'c'
+        tape[1] = 'd'
+        self.assertEqual(str(tape), 'cd' + 'a' * (10 * PAGE_SIZE - 2))
+        self.assertEqual(forks[0][0], 'b')
+
+    def test_filter(self):
+        tape = PersistentTape('abcab', -2)
+        fork = tape.fork()
+        tape.filter('b' + LAMBDA)
+        self.assertEqual(str(tape), 'b' + LAMBDA + LAMBDA + 'b')
+        self.assertEqual(tape.bounds, (-1, 3))
+        self.assertEqual(str(fork), 'abcab')
+        tape.filter(LAMBDA)
+        self.assertEqual(str(tape), '')
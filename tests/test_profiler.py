@@ -0,0 +1,41 @@
+import unittest
+
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.constants import BY_STEP_MODE
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            'alphabet': 'ab',
+            'tape': 'aab',
+            'rules': {
+                "q0": {"a": ["b", "R", "q0"], "b": ["a", "R", "q0"], "λ": ["λ", "L", "q1"]},
+                "q1": {"a": ["a", "L", "q1"], "b": ["b", "L", "q1"], "λ": ["λ", "N", "!"]},
+            }
+        }
+
+    def test_counters(self):
+        machine = TuringMachine(**self.config)
+        result = machine.run(profile=True)
+        profile = result["profile"]
+        self.assertEqual(profile["rules"], {
+            "q0": {"a": 2, "b": 1, "λ": 1},
+            "q1": {"a": 1, "b": 2, "λ": 1},
+        })
+        self.assertEqual(sum(sum(line.values()) for line in profile["rules"].values()), result["iterations"])
+        self.assertEqual(profile["head_travel"], 7)
+        self.assertEqual(profile["head_range"], [-1, 3])
+        self.assertEqual(profile["tape_extent"], 5)
+        self.assertEqual(set(profile["time"]), {"compile", "run", "result"})
+        self.assertEqual(result["result"], TuringMachine(**self.config).run()["result"])
+
+    def test_callback(self):
+        profiles = []
+        result = TuringMachine(**self.config).run(BY_STEP_MODE, max_tacts=3, profile=profiles.append)
+        self.assertEqual(profiles, [result["profile"]])
+        self.assertEqual(profiles[0]["rules"], {"q0": {"a": 2, "b": 1}})
+        self.assertEqual(len(result["steps"]), 3)
+
+    def test_not_profiled(self):
+        self.assertNotIn("profile", TuringMachine(**self.config).run())
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.snapshot import Snapshot
+from turing_machine.constants import ARRAY_TAPE, BY_STEP_MODE, SUCCESSFUL_STATUS
+
+
+class TestSnapshot(unittest.TestCase):
+    config = {
+        'alphabet': '01',
+        'tape': '1011',
+        'rules': {
+            "q0": {
+                "0": ["0", "R", "q0"],
+                "1": ["1", "R", "q0"],
+                "λ": ["λ", "L", "q1"]
+            },
+            "q1": {
+                "0": ["1", "N", "q2"],
+                "1": ["0", "L", "q1"],
+                "λ": ["1", "N", "q2"]
+            },
+            "q2": {
+                "0": ["0", "L", "q2"],
+                "1": ["1", "L", "q2"],
+                "λ": ["λ", "R", "q0"]
+            }
+        }
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'machine.checkpoint')
+
+    def test_snapshot_restore(self):
+        machine = TuringMachine(**self.config, tape_engine=ARRAY_TAPE)
+        machine.run(max_tacts=100)
+        snapshot = machine.snapshot()
+        self.assertEqual(snapshot.tacts, 100)
+
+        snapshot.save(self.path)
+        self.assertEqual(Snapshot.load(self.path), snapshot)
+
+        machine.run(max_tacts=50)
+        expected = machine.snapshot()
+
+        machine.restore(snapshot)
+        self.assertEqual(machine.snapshot(), snapshot)
+        machine.run(max_tacts=50)
+        self.assertEqual(machine.snapshot(), expected)
+
+    def test_resume_from_checkpoint(self):
+        machine = TuringMachine(**self.config)
+        expected = machine.run(max_tacts=1000)
+
+        killed = TuringMachine(**self.config)
+        killed.run(max_tacts=730, checkpoint=self.path, checkpoint_tacts=100)
+        self.assertEqual(Snapshot.load(self.path).tacts, 730)
+
+        resumed = TuringMachine(**self.config)
+        resumed.restore(Snapshot.load(self.path))
+        result = resumed.run(max_tacts=1000 - resumed.tacts, checkpoint=self.path, checkpoint_tacts=100)
+
+        self.assertEqual(result["result"], expected["result"])
+        self.assertEqual(result["head_position"], expected["head_position"])
+        self.assertEqual(resumed.snapshot(), machine.snapshot())
+
+    def test_checkpoint_steps(self):
+        config = dict(self.config, rules=dict(self.config["rules"], q1={
+            "0": ["1", "N", "!"],
+            "1": ["0", "L", "q1"],
+            "λ": ["1", "N", "!"]
+        }))
+        expected = TuringMachine(**config).run(BY_STEP_MODE)
+
+        machine = TuringMachine(**config)
+        result = machine.run(BY_STEP_MODE, checkpoint=self.path, checkpoint_tacts=3)
+        self.assertEqual(result, expected)
+        self.assertEqual(result["status"], SUCCESSFUL_STATUS)
+        self.assertEqual(Snapshot.load(self.path), machine.snapshot())
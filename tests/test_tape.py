@@ -1,6 +1,6 @@
 import unittest
 
-from turing_machine.tape import Tape
+from turing_machine.tape import Tape, TAPE_ENGINES
 from turing_machine.constants import LAMBDA
 
 
@@ -49,3 +49,124 @@ class TestTape(unittest.TestCase):
 
         tape[-5] = 'w'
         self.assertEqual(str(tape), 'w' + LAMBDA + LAMBDA + 'est')
+
+    def test_erase_bounds(self):
+        tape = Tape('abc')
+        tape[2] = LAMBDA
+        tape[0] = LAMBDA
+        self.assertEqual(str(tape), 'b')
+        self.assertEqual(tape.string_with_position(-1), '[' + LAMBDA + ']' + LAMBDA + 'b')
+
+        tape[1] = LAMBDA
+        self.assertEqual(str(tape), '')
+
+        tape[-2] = 'x'
+        self.assertEqual(str(tape), 'x')
+
+    def test_erase_sparse_bounds(self):
+        tape = Tape('a')
+        tape[1000] = 'b'
+        tape[500] = 'c'
+        tape[1000] = LAMBDA
+        self.assertEqual(str(tape), 'a' + LAMBDA * 499 + 'c')
+
+        tape[0] = LAMBDA
+        self.assertEqual(str(tape), 'c')
+
+    def test_lazy_bounds(self):
+        for engine in TAPE_ENGINES.values():
+            tape = engine('a' + LAMBDA * 3000 + 'b' + LAMBDA * 100000 + 'c', -10)
+            tape[-10] = LAMBDA
+            tape[102992] = LAMBDA
+            self.assertEqual(tape.bounds, (2991, 2992), engine)
+            tape[-20000] = 'd'
+            tape[2991] = LAMBDA
+            self.assertEqual(tape.bounds, (-20000, -19999), engine)
+            tape[-20000] = LAMBDA
+            self.assertEqual(tape.bounds, (0, 0), engine)
+            self.assertEqual(str(tape), '', engine)
+            tape[5] = 'e'
+            self.assertEqual(tape.bounds, (5, 6), engine)
+
+    def test_input_blanks(self):
+        tape = Tape(LAMBDA + 'ab' + LAMBDA, -1)
+        self.assertEqual(tape.bounds, (-1, 3))
+        self.assertEqual(str(tape), LAMBDA + 'ab' + LAMBDA)
+        tape[2] = LAMBDA
+        self.assertEqual(str(tape), LAMBDA + 'ab' + LAMBDA)
+
+        tape[0] = LAMBDA
+        self.assertEqual(str(tape), LAMBDA * 2 + 'b' + LAMBDA)
+        tape[-1] = 'x'
+        tape[-1] = LAMBDA
+        self.assertEqual(tape.bounds, (1, 2))
+        self.assertEqual(str(tape), 'b')
+
+    def test_read_does_not_extend(self):
+        tape = Tape('ab')
+        self.assertEqual(tape[-5], LAMBDA)
+        self.assertEqual(tape[10], LAMBDA)
+        tape[1] = 'c'
+        self.assertEqual(str(tape), 'ac')
+
+    def test_offset(self):
+        tape = Tape('ab' + LAMBDA + 'c', -2)
+        self.assertEqual(tape[-2], 'a')
+        self.assertEqual(tape[1], 'c')
+        self.assertEqual(tape.bounds, (-2, 2))
+        self.assertEqual(tape.string_with_position(0), 'ab[' + LAMBDA + ']c')
+
+        tape[-3] = 'x'
+        self.assertEqual(str(tape), 'xab' + LAMBDA + 'c')
+
+    def test_fingerprint(self):
+        tape = Tape('abc')
+        empty = Tape().fingerprint()
+        initial = tape.fingerprint()
+        self.assertNotEqual(initial, empty)
+
+        tape[5] = 'x'
+        tape[1] = 'c'
+        self.assertNotEqual(tape.fingerprint(), initial)
+        tape[1] = 'b'
+        tape[5] = LAMBDA
+        self.assertEqual(tape.fingerprint(), initial)
+
+        shifted = Tape('abc', 1)
+        self.assertNotEqual(shifted.fingerprint(), initial)
+        shifted[0] = 'a'
+        shifted[1] = 'b'
+        shifted[2] = 'c'
+        shifted[3] = LAMBDA
+        self.assertEqual(shifted.fingerprint(), initial)
+        self.assertEqual(str(shifted), str(tape))
+
+    def test_fork(self):
+        tape = Tape('abc')
+        tape.fingerprint()
+        fork = tape.fork()
+        fork[1] = 'x'
+        fork[-100] = 'y'
+        tape[2] = LAMBDA
+        self.assertEqual(str(tape), 'ab')
+        self.assertEqual(str(fork), 'y' + LAMBDA * 99 + 'axc')
+        self.assertEqual(tape.fingerprint(), Tape('ab').fingerprint())
+        self.assertEqual(fork.fingerprint(), Tape('y' + LAMBDA * 99 + 'axc', -100).fingerprint())
+
+    def test_bytes_input(self):
+        self.assertEqual(str(Tape(b'abc', 2)), 'abc')
+        self.assertEqual(Tape(bytearray(b'ab'))[1], 'b')
+        tape = Tape(memoryview(('x' + LAMBDA + 'ÿ').encode()), -1)
+        self.assertEqual(tape.bounds, (-1, 2))
+        self.assertEqual(tape[1], 'ÿ')
+        self.assertEqual(tape.tobytes(), ('x' + LAMBDA + 'ÿ').encode())
+        self.assertEqual(str(Tape(b'')), '')
+
+    def test_slice(self):
+        tape = Tape('ab' + LAMBDA + 'c', -1)
+        self.assertEqual(tape.slice(-3, 5), LAMBDA * 2 + 'ab' + LAMBDA + 'c' + LAMBDA * 2)
+        self.assertEqual(tape.slice(0, 2), 'b' + LAMBDA)
+        self.assertEqual(tape.slice(10, 12), LAMBDA * 2)
+        self.assertEqual(tape.slice(2, 2), '')
+        self.assertEqual(tape.tobytes(0, 3), ('b' + LAMBDA + 'c').encode())
+        self.assertEqual(Tape().string_with_position(2), LAMBDA * 2 + '[' + LAMBDA + ']')
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from turing_machine.turing_machine import TuringMachine
+from turing_machine.trace import TraceWriter, TraceReader, main
+from turing_machine.constants import BY_STEP_MODE
+
+
+class TestTrace(unittest.TestCase):
+    config = {
+        'alphabet': 'ab',
+        'tape': 'aabbaba',
+        'rules': {
+            "q0": {
+                "a": ["b", "R", "q1"],
+                "b": ["a", "R", "q0"],
+                "λ": ["λ", "L", "q2"]
+            },
+            "q1": {
+                "a": ["a", "R", "q0"],
+                "b": ["b", "N", "q0"],
+                "λ": ["λ", "L", "q2"]
+            },
+            "q2": {
+                "a": ["a", "L", "q2"],
+                "b": ["b", "L", "q2"],
+                "λ": ["λ", "N", "!"]
+            }
+        }
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'run.trace')
+
+    def test_record(self):
+        machine = TuringMachine(**self.config)
+        with TraceWriter(self.path, machine) as trace:
+            result = machine.run(BY_STEP_MODE, trace=trace)
+
+        with TraceReader(self.path) as trace:
+            self.assertEqual(len(trace), result["iterations"])
+            self.assertEqual([step._asdict() for step in trace], result["steps"])
+            self.assertEqual(trace[5]._asdict(), result["steps"][5])
+            self.assertEqual(trace[-1].next_state, "!")
+            self.assertEqual(trace[3:6], list(trace)[3:6])
+            with self.assertRaises(IndexError):
+                trace[len(trace)]
+
+    def test_cli(self):
+        machine_path = os.path.join(self.directory.name, 'machine.json')
+        with open(machine_path, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['record', machine_path, self.path, '--tape-engine', 'array'])
+            main(['show', self.path, '--start', '2', '--count', '3'])
+            main(['replay', machine_path, self.path, '--tact', '4'])
+
+        machine = TuringMachine(**self.config)
+        machine.run(max_tacts=4)
+        lines = output.getvalue().splitlines()
+        self.assertIn("Status: successful", lines)
+        self.assertEqual(len([line for line in lines if '->' in line]), 3)
+        self.assertEqual(lines[-1], machine.tape.string_with_position(machine.position))
+
+    def test_cli_tape_file(self):
+        machine_path = os.path.join(self.directory.name, 'machine.json')
+        with open(machine_path, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f)
+        tape_path = os.path.join(self.directory.name, 'tape.bin')
+        with open(tape_path, 'wb') as f:
+            f.write(b'bbab')
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['record', machine_path, self.path, '--tape-file', tape_path])
+            main(['replay', machine_path, self.path, '--tape-file', tape_path])
+
+        machine = TuringMachine(**dict(self.config, tape='bbab'))
+        machine.run()
+        self.assertEqual(output.getvalue().splitlines()[-1], machine.tape.string_with_position(machine.position))
@@ -1,8 +1,12 @@
+import time
 import unittest
 
 from turing_machine.turing_machine import TuringMachine
+from turing_machine.tape import TAPE_ENGINES
 from turing_machine.constants import NORMAL_MODE, BY_STEP_MODE, STOP_STATE
 from turing_machine.constants import MAX_ITERATIONS_REACHED_STATUS, SUCCESSFUL_STATUS, MAX_ITERATIONS
+from turing_machine.constants import ARRAY_TAPE, ACCELERATED_MODE
+from turing_machine.constants import TIME_LIMIT_STATUS, TAPE_LIMIT_STATUS, RUN_WINDOW
 
 
 class TestTape(unittest.TestCase):
@@ -103,3 +107,245 @@ class TestTape(unittest.TestCase):
         self.assertEqual(result["iterations"], MAX_ITERATIONS)
         self.assertEqual(result["result"], "abba")
         self.assertEqual(result["head_position"], MAX_ITERATIONS)
+
+    def test_array_tape_engine(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'aabbaba',
+            'rules': {
+                "q0": {
+                    "a": ["b", "L", "q0"],
+                    "b": ["a", "L", "q0"],
+                    "λ": ["b", "N", "!"]
+                },
+            }
+        }
+
+        machine = TuringMachine(**config, position=6, tape_engine=ARRAY_TAPE)
+        result = machine.run()
+
+        self.assertEqual(result["status"], SUCCESSFUL_STATUS)
+        self.assertEqual(result["iterations"], 8)
+        self.assertEqual(result["result"], "bbbaabab")
+        self.assertEqual(result["head_position"], -1)
+
+        machine.set_tape_string("ab", position=1)
+        machine.state = "q0"
+        result = machine.run()
+        self.assertEqual(result["result"], "bba")
+
+    def test_compiled_rules_cache(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'ab',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q0"],
+                    "b": ["a", "R", "q0"],
+                    "λ": ["λ", "N", "!"]
+                },
+            }
+        }
+
+        machine = TuringMachine(**config)
+        compiled = machine.compile()
+        self.assertIs(machine.compile(), compiled)
+
+        machine.rules["q0"]["b"] = ["b", "R", "q0"]
+        self.assertIsNot(machine.compile(), compiled)
+        self.assertEqual(machine.run()["result"], "bb")
+
+    def test_missing_rule(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'aab',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q0"],
+                },
+            }
+        }
+
+        machine = TuringMachine(**config)
+        with self.assertRaises(KeyError):
+            machine.run()
+
+        self.assertEqual(machine.get_tape_string(), "bbb")
+        self.assertEqual(machine.position, 2)
+        self.assertEqual(machine.state, "q0")
+
+        self.assertEqual(machine.problems(), ["state q0 has no rules for b, λ", "state ! is unreachable from q0"])
+        with self.assertRaises(ValueError):
+            TuringMachine(strict=True, **config)
+
+        machine.rules["q0"].update({"b": ["b", "N", "!"], "λ": ["λ", "N", "!"]})
+        self.assertEqual(machine.problems(), [])
+        TuringMachine(strict=True, **config)
+
+        machine.rules["q0"]["b"] = ["b", "N"]
+        self.assertEqual(machine.problems(), ["state q0 has malformed rule for b"])
+        with self.assertRaises(ValueError):
+            TuringMachine(strict=True, **config)
+
+    def test_run_batch(self):
+        config = {
+            'alphabet': 'ab',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q0"],
+                    "b": ["a", "R", "q0"],
+                    "λ": ["λ", "N", "!"]
+                },
+            }
+        }
+
+        inputs = ["", "a", "abba", "b" * 100, "aab" * 50]
+        machine = TuringMachine(**config)
+        results = list(machine.run_batch(inputs, max_tacts=100, workers=2, chunksize=2))
+
+        self.assertEqual(len(results), len(inputs))
+        for tape, result in zip(inputs, results):
+            expected = TuringMachine(**config, tape=tape).run(max_tacts=100)
+            self.assertEqual(result, expected)
+
+        self.assertEqual(results[3]["status"], MAX_ITERATIONS_REACHED_STATUS)
+        self.assertEqual(machine.get_tape_string(), "")
+
+    def test_iter_steps(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'aabbaba',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q0"],
+                    "b": ["a", "R", "q0"],
+                    "λ": ["λ", "N", "!"]
+                },
+            }
+        }
+
+        machine = TuringMachine(**config)
+        steps = machine.iter_steps()
+        first = next(steps)
+        self.assertEqual(first, ("q0", "q0", "a", "b", "R", 0))
+        self.assertEqual(machine.position, 1)
+        self.assertEqual(machine.get_tape_string(), "babbaba")
+
+        self.assertEqual([step.tact for step in steps], list(range(1, 8)))
+        self.assertEqual(machine.state, STOP_STATE)
+
+    def test_accelerated_mode(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'ab',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q0"],
+                    "b": ["a", "R", "q0"],
+                    "λ": ["a", "L", "q1"]
+                },
+                "q1": {
+                    "a": ["a", "L", "q1"],
+                    "b": ["b", "L", "q1"],
+                    "λ": ["λ", "R", "q0"]
+                }
+            }
+        }
+
+        for max_tacts in (1, 2, 3, 17, 1000, 12345):
+            expected = TuringMachine(**config).run(max_tacts=max_tacts)
+            machine = TuringMachine(**config)
+            result = machine.run(ACCELERATED_MODE, max_tacts=max_tacts)
+            self.assertEqual(result, expected)
+            self.assertEqual(machine.tacts, max_tacts)
+
+        config["rules"]["q1"]["λ"] = ["λ", "N", "!"]
+        result = TuringMachine(**config).run(ACCELERATED_MODE)
+        self.assertEqual(result["status"], SUCCESSFUL_STATUS)
+        self.assertEqual(result["iterations"], 6)
+        self.assertEqual(result["result"], "baa")
+        self.assertEqual(result["head_position"], -1)
+
+    def test_run_window(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'a' * 3 * RUN_WINDOW + 'bx' + 'a' * RUN_WINDOW + 'x',
+            'rules': {
+                "q0": {
+                    "a": ["a", "R", "q0"],
+                    "b": ["b", "L", "q1"],
+                },
+                "q1": {
+                    "a": ["b", "L", "q1"],
+                    "b": ["b", "L", "q1"],
+                    "λ": ["a", "R", "q0"]
+                }
+            }
+        }
+
+        for tape_engine in TAPE_ENGINES:
+            for max_tacts in (1, RUN_WINDOW + 1, 7 * RUN_WINDOW):
+                expected = TuringMachine(tape_engine=tape_engine, **config).run(BY_STEP_MODE, max_tacts=max_tacts)
+                result = TuringMachine(tape_engine=tape_engine, **config).run(max_tacts=max_tacts)
+                del expected["steps"]
+                self.assertEqual(result, expected)
+                self.assertTrue(result["result"].endswith("x"))
+
+    def test_fingerprint(self):
+        config = {
+            'alphabet': 'ab',
+            'tape': 'ab',
+            'rules': {
+                "q0": {
+                    "a": ["b", "R", "q1"],
+                    "b": ["a", "L", "q0"],
+                    "λ": ["λ", "N", "!"]
+                },
+                "q1": {
+                    "a": ["b", "R", "q1"],
+                    "b": ["b", "L", "q0"],
+                    "λ": ["λ", "N", "!"]
+                }
+            }
+        }
+
+        machine = TuringMachine(**config)
+        other = TuringMachine(**config, tape_engine=ARRAY_TAPE)
+        self.assertEqual(machine.fingerprint(), other.fingerprint())
+
+        machine.run(max_tacts=1)
+        self.assertNotEqual(machine.fingerprint(), other.fingerprint())
+        other.run(ACCELERATED_MODE, max_tacts=1)
+        self.assertEqual(machine.fingerprint(), other.fingerprint())
+
+    def test_limits(self):
+        config = {
+            'alphabet': 'a',
+            'tape': '',
+            'rules': {
+                "q0": {"λ": ["a", "R", "q0"]},
+            }
+        }
+
+        for tape_engine in TAPE_ENGINES:
+            machine = TuringMachine(tape_engine=tape_engine, **config)
+            result = machine.run(max_tacts=10 ** 6, max_cells=1000, limits_tacts=64)
+            self.assertEqual(result["status"], TAPE_LIMIT_STATUS)
+            self.assertEqual(result["iterations"], 1024)
+            self.assertEqual(len(result["result"]), 1024)
+
+            result = machine.run(BY_STEP_MODE, max_tacts=10 ** 6, deadline=time.monotonic() - 1)
+            self.assertEqual(result["status"], TIME_LIMIT_STATUS)
+            self.assertEqual(result["iterations"], 0)
+            self.assertEqual(result["steps"], [])
+
+            result = machine.run(max_tacts=100, max_cells=10 ** 6, deadline=time.monotonic() + 60)
+            self.assertEqual(result["status"], MAX_ITERATIONS_REACHED_STATUS)
+            self.assertEqual(result["iterations"], 100)
+
+            machine = TuringMachine(tape_engine=tape_engine, **config)
+            result = machine.run(max_tacts=10 ** 9, deadline=time.monotonic() + 0.05, limits_tacts=1000)
+            self.assertEqual(result["status"], TIME_LIMIT_STATUS)
+            self.assertEqual(result["iterations"] % 1000, 0)
+            self.assertEqual(machine.tacts, result["iterations"])
+            self.assertEqual(result["result"], "a" * result["iterations"])
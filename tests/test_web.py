@@ -0,0 +1,179 @@
+import gettext
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import turing_machine.web as web
+
+
+class TestWeb(unittest.TestCase):
+    def setUp(self):
+        gettext.install('turing_machine')
+        self.upload = tempfile.TemporaryDirectory()
+        path = os.path.dirname(web.__file__)
+        web.app.config['JS_FOLDER'] = path + '/web/js'
+        web.app.config['CSS_FOLDER'] = path + '/web/css'
+        web.app.config['UPLOAD_FOLDER'] = self.upload.name
+        self.client = web.app.test_client()
+
+        config = {
+            'alphabet': 'a',
+            'tape': 'a' * 1200,
+            'rules': {
+                "q0": {"a": ["a", "R", "q0"], "λ": ["λ", "N", "!"]},
+            }
+        }
+        with open(os.path.join(self.upload.name, 'machine.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+    def tearDown(self):
+        self.upload.cleanup()
+
+    def test_view_does_not_run(self):
+        response = self.client.get('/view-machine/machine.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/machine-steps/machine.json', response.get_data(as_text=True))
+        self.assertNotIn('curr_state', response.get_data(as_text=True))
+
+    def test_steps_stream(self):
+        response = self.client.get('/machine-steps/machine.json')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        steps = [step for line in lines[:-1] for step in line["steps"]]
+        self.assertEqual([len(line["steps"]) for line in lines[:-1]], [500, 500, 201])
+        self.assertEqual([step["tact"] for step in steps], list(range(1201)))
+        self.assertEqual(steps[-1]["next_state"], "!")
+
+        result = lines[-1]["result"]
+        self.assertEqual(result["status"], "successful")
+        self.assertEqual(result["iterations"], 1201)
+        self.assertEqual(result["head_position"], 1200)
+        self.assertEqual(result["profile"]["rules"], {"q0": {"a": 1200, "λ": 1}})
+
+    def test_cache(self):
+        web.results.clear()
+        hits = web.results.hits
+        first = self.client.get('/machine-steps/machine.json').get_data(as_text=True)
+        page = self.client.get('/view-machine/machine.json').get_data(as_text=True)
+        self.assertEqual(web.results.hits, hits)
+
+        self.assertEqual(self.client.get('/machine-steps/machine.json').get_data(as_text=True), first)
+        self.assertEqual(self.client.get('/view-machine/machine.json').get_data(as_text=True), page)
+        self.assertEqual(web.results.hits, hits + 2)
+        self.assertEqual(len(web.results), 2)
+
+    def test_worker_processes(self):
+        web.results.clear()
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(1) as pool:
+            web.pool, web.pool_queue, web.manager = pool, 1, manager
+            try:
+                response = self.client.get('/machine-steps/machine.json')
+                lines = response.get_data(as_text=True).splitlines()
+                self.assertEqual(json.loads(lines[-1])["result"]["iterations"], 1201)
+                for _ in range(100):
+                    if not web.pending:
+                        break
+                    time.sleep(0.01)
+                self.assertEqual(web.pending, {})
+                self.assertEqual(len(web.results), 1)
+            finally:
+                web.pool, web.pool_queue, web.manager = None, 0, None
+
+    def test_finished_worker_run(self):
+        class DonePool:
+            """Runs the function at once, returning finished future."""
+            def submit(self, function, *args):
+                future = Future()
+                future.set_result(function(*args))
+                return future
+
+        web.results.clear()
+        web.pool, web.pool_queue, web.manager = DonePool(), 1, SimpleNamespace(Queue=queue.Queue)
+        try:
+            lines = self.client.get('/machine-steps/machine.json').get_data(as_text=True).splitlines()
+            self.assertEqual(json.loads(lines[-1])["result"]["iterations"], 1201)
+            self.assertEqual(web.pending, {})
+            self.assertEqual(len(web.results), 1)
+        finally:
+            web.pool, web.pool_queue, web.manager = None, 0, None
+
+    def test_worker_streaming(self):
+        release = threading.Event()
+
+        class GatedQueue(queue.Queue):
+            """Holds the run after its first line till released."""
+            def put(self, item, *args, **kwargs):
+                super().put(item, *args, **kwargs)
+                release.wait(5)
+
+        class ThreadPool:
+            """Runs the function in a thread."""
+            def submit(self, function, *args):
+                future = Future()
+                threading.Thread(target=lambda: future.set_result(function(*args))).start()
+                return future
+
+        web.results.clear()
+        web.pool, web.pool_queue, web.manager = ThreadPool(), 1, SimpleNamespace(Queue=GatedQueue)
+        try:
+            response = self.client.get('/machine-steps/machine.json', buffered=False)
+            chunks = iter(response.response)
+            self.assertEqual(len(json.loads(next(chunks))["steps"]), 500)
+            self.assertFalse(release.is_set())
+            self.assertEqual(len(web.pending), 1)
+            release.set()
+            lines = b''.join(chunks).decode().splitlines()
+            self.assertEqual(json.loads(lines[-1])["result"]["iterations"], 1201)
+        finally:
+            release.set()
+            web.pool, web.pool_queue, web.manager = None, 0, None
+
+    def test_time_limit(self):
+        web.results.clear()
+        web.app.config['RUN_TIMEOUT'] = -1
+        try:
+            lines = self.client.get('/machine-steps/machine.json').get_data(as_text=True).splitlines()
+        finally:
+            web.app.config['RUN_TIMEOUT'] = 10.0
+        self.assertEqual(json.loads(lines[-1])["result"]["status"], "time limit reached")
+        self.assertEqual(len(web.results), 0)
+
+    def test_tape_limit(self):
+        web.results.clear()
+        web.app.config['MAX_CELLS'] = 100
+        try:
+            lines = self.client.get('/machine-steps/machine.json').get_data(as_text=True).splitlines()
+        finally:
+            web.app.config['MAX_CELLS'] = 1000000
+        self.assertEqual(json.loads(lines[-1])["result"]["status"], "tape limit reached")
+        self.assertEqual(json.loads(lines[-1])["result"]["iterations"], 0)
+
+    def test_failed_run(self):
+        web.results.clear()
+        config = {'alphabet': 'ab', 'tape': 'aab', 'rules': {"q0": {"a": ["a", "R", "q0"]}}}
+        with open(os.path.join(self.upload.name, 'failing.json'), 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+        with self.assertLogs(web.app.logger, 'ERROR'):
+            lines = self.client.get('/machine-steps/failing.json').get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"error": "the run has failed"}])
+        self.assertEqual(len(web.results), 0)
+
+    def test_stop_on_max_tacts(self):
+        web.results.clear()
+        web.app.config['MAX_TACTS'] = 1201
+        try:
+            lines = self.client.get('/machine-steps/machine.json').get_data(as_text=True).splitlines()
+        finally:
+            web.app.config['MAX_TACTS'] = web.MAX_ITERATIONS
+        result = json.loads(lines[-1])["result"]
+        self.assertEqual(result["status"], "max iterations reached")
+        self.assertEqual(result["iterations"], 1201)
@@ -5,8 +5,8 @@ import turing_machine.web as web
 
 
 def main():
-    if len(sys.argv) == 2 and sys.argv[1] == 'web':
-        web.main()
+    if len(sys.argv) >= 2 and sys.argv[1] == 'web':
+        web.main(sys.argv[2:])
     else:
         gui.main()
 
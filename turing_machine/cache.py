@@ -0,0 +1,81 @@
+"""
+Size-bounded cache of machine run results, shared by requests of the web viewer.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def machine_key(config: dict, max_tacts: int) -> str:
+    """Returns hash of everything a run result depends on: the alphabet, the rules, the tape, the head position, the initial state and the tacts limit.
+
+    :param config: keyword arguments of :class:`~turing_machine.turing_machine.TuringMachine`
+    """
+    content = [config.get(name) for name in ('alphabet', 'rules', 'tape', 'position', 'initial_state')]
+    content.append(max_tacts)
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """Least recently used cache of values, bounded by their total size.
+
+    Values are strings, bytes or lists of them, their size is their total
+    length. When the total size exceeds `max_size`, the least recently used
+    values are evicted. A value larger than `max_size` is not stored at all.
+    The cache may be used from many threads.
+
+    :param max_size: total size of values to keep at most
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__values = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def sizeof(value) -> int:
+        """Returns size of the value."""
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        return sum(len(part) for part in value)
+
+    def get(self, key, default=None):
+        """Returns the value cached for the key, `default` if there is none."""
+        with self.__lock:
+            value = self.__values.get(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.__values.move_to_end(key)
+            self.hits += 1
+            return value[0]
+
+    def put(self, key, value):
+        """Caches the value for the key, evicting the least recently used values to fit it."""
+        size = self.sizeof(value)
+        if size > self.max_size:
+            return
+        with self.__lock:
+            old = self.__values.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self.__values[key] = value, size
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted) = self.__values.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        """Removes all the values."""
+        with self.__lock:
+            self.__values.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __contains__(self, key):
+        return key in self.__values
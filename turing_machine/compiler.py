@@ -0,0 +1,206 @@
+"""
+Compilation of Turing machine rules into integer-indexed tables.
+"""
+import re
+from types import MappingProxyType
+from typing import Dict, Iterable
+from turing_machine.constants import STOP_STATE, MOVE_LEFT, MOVE_NONE, MOVE_RIGHT
+
+MOVE_DELTAS = {MOVE_LEFT: -1, MOVE_RIGHT: 1}
+"""Maps move of a machine to the change of its head position (any other move stays)."""
+MOVES = (MOVE_LEFT, MOVE_NONE, MOVE_RIGHT)
+"""All the valid moves of a machine."""
+RULE_SEPARATOR = re.compile(r'[,\s]+')
+"""Separates character, move and state in a rule written as text."""
+
+
+def parse_rule(text: str, alphabet: str, states: Iterable[str]) -> list:
+    """Parses a rule written as text, e.g. ``"a R q1"`` or ``"a,r,!"``.
+
+    :param alphabet: characters the rule may write
+    :param states: states the rule may go to (besides :data:`STOP_STATE`)
+    :returns: [symbol, move, next state]
+    :raises ValueError: if the text is not a valid rule
+    """
+    rule = RULE_SEPARATOR.split(text.strip())
+    if len(rule) != 3:
+        raise ValueError('rule must be symbol, move and state: %r' % text)
+    c, move, q = rule[0], rule[1].upper(), rule[2]
+    if len(c) != 1 or c not in alphabet:
+        raise ValueError('unknown symbol %r' % c)
+    if move not in MOVES:
+        raise ValueError('unknown move %r' % rule[1])
+    if q != STOP_STATE and q not in states:
+        raise ValueError('unknown state %r' % q)
+    return [c, move, q]
+
+
+def rules_key(alphabet: str, rules: Dict[str, Dict[str, list]]) -> tuple:
+    """Returns hashable snapshot of the alphabet and the rules, which changes whenever they do."""
+    return alphabet, tuple(
+        (q, tuple((c, tuple(rule) if isinstance(rule, (list, tuple)) else rule) for c, rule in line.items()))
+        for q, line in rules.items()
+    )
+
+
+class CompiledRules:
+    """Rules of a Turing machine with states and characters interned to integers.
+
+    Characters are numbered in order of appearance in the alphabet and then in
+    the rules, states are numbered in order of appearance in the rules. Rules
+    form a flat table of `width` columns per state: the entry for state `q` and
+    character `c` is ``table[states_codes[q] * width + symbol_codes[c]]``.
+    The last column is reserved for characters unknown to the machine.
+
+    Every entry is either ``None`` (no rule) or a tuple ``(write, delta, row)``
+    of the code of character to write, head shift and first index of the next
+    state row, so a run loop doesn't need to decode anything.
+
+    When there are at most 256 columns, `sweeps` is a table of the same shape
+    describing sweeps: a rule which keeps the state and moves the head is
+    repeated while the head meets characters with rules of the same kind.
+    Its entries are either ``None`` or tuples ``(delta, members, translation)``
+    of the head shift, bytes of character codes continuing the sweep and
+    table for :meth:`bytes.translate` rewriting them.
+
+    Compiled rules are immutable and compare and hash by `key`, the snapshot
+    of the alphabet and the rules they are compiled from.
+
+    A rule which is not a [symbol, move, next state] triple of strings is
+    left out of the table and listed in `malformed` as ``(state, character)``.
+
+    :param str alphabet: the alphabet of the machine (including :data:`LAMBDA`)
+    :param rules: maps state, character to [symbol, move, next state]
+    :type rules: {str: {str: [str]}}
+    """
+    def __init__(self, alphabet: str, rules: Dict[str, Dict[str, list]], key: tuple = None):
+        set_attribute = super().__setattr__
+        set_attribute('key', rules_key(alphabet, rules) if key is None else key)
+        set_attribute('alphabet', alphabet)
+
+        well_formed = {
+            q: {c: rule for c, rule in line.items() if isinstance(rule, (list, tuple)) and len(rule) == 3 and all(isinstance(x, str) for x in rule)}
+            for q, line in rules.items()
+        }
+        set_attribute('malformed', tuple((q, c) for q, line in rules.items() for c in line if c not in well_formed[q]))
+        rules = well_formed
+
+        symbols = dict.fromkeys(alphabet)
+        states = dict.fromkeys(rules)
+        for line in rules.values():
+            for c, (c_next, _, q_next) in line.items():
+                symbols.update(dict.fromkeys((c, c_next)))
+                states.setdefault(q_next)
+        states.setdefault(STOP_STATE)
+
+        set_attribute('symbols', tuple(symbols))
+        set_attribute('symbol_codes', MappingProxyType({c: code for code, c in enumerate(self.symbols)}))
+        set_attribute('states', tuple(states))
+        set_attribute('state_codes', MappingProxyType({q: code for code, q in enumerate(self.states)}))
+        set_attribute('defined', tuple(rules))
+
+        set_attribute('width', len(self.symbols) + 1)
+        set_attribute('unknown_code', self.width - 1)
+        set_attribute('stop_row', self.state_codes[STOP_STATE] * self.width)
+        set_attribute('moves', tuple(
+            (q, c, move) for q, line in rules.items() for c, (_, move, _) in line.items() if move not in MOVES
+        ))
+
+        table = [None] * (len(self.states) * self.width)
+        for q, line in rules.items():
+            row = self.state_codes[q] * self.width
+            for c, (c_next, move, q_next) in line.items():
+                table[row + self.symbol_codes[c]] = (
+                    self.symbol_codes[c_next],
+                    MOVE_DELTAS.get(move, 0),
+                    self.state_codes[q_next] * self.width
+                )
+        set_attribute('table', tuple(table))
+        set_attribute('sweeps', self.__sweeps() if self.width <= 256 else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('compiled rules are immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledRules) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def rule(self, q: str, c: str) -> tuple:
+        """Returns the table entry for state `q` and character `c`, ``None`` if there is no rule."""
+        code = self.state_codes.get(q)
+        if code is None:
+            return None
+        return self.table[code * self.width + self.symbol_codes.get(c, self.unknown_code)]
+
+    def problems(self, initial_state: str) -> list:
+        """Returns descriptions of what is wrong with the rules of a machine starting from `initial_state`:
+
+            * states with no rule for some character of the alphabet
+            * rules which are not [symbol, move, next state] triples
+            * characters read or written by rules, which are not in the alphabet
+            * states the rules go to, which have no rules themselves
+            * moves other than :data:`MOVES`
+            * :data:`STOP_STATE` being unreachable from the initial state
+        """
+        problems = []
+        if initial_state != STOP_STATE and initial_state not in self.defined:
+            problems.append('initial state %s has no rules' % initial_state)
+
+        for q in self.defined:
+            missing = [c for c in self.alphabet if self.rule(q, c) is None and (q, c) not in self.malformed]
+            if missing:
+                problems.append('state %s has no rules for %s' % (q, ', '.join(missing)))
+
+        for q, c in self.malformed:
+            problems.append('state %s has malformed rule for %s' % (q, c))
+
+        unknown = [c for c in self.symbols if c not in self.alphabet]
+        if unknown:
+            problems.append('rules use characters out of the alphabet: %s' % ', '.join(unknown))
+
+        undefined = [q for q in self.states if q != STOP_STATE and q not in self.defined]
+        if undefined:
+            problems.append('rules go to states with no rules: %s' % ', '.join(undefined))
+
+        for q, c, move in self.moves:
+            problems.append('state %s has unknown move %s for %s' % (q, move, c))
+
+        if STOP_STATE not in self.reachable(initial_state):
+            problems.append('state %s is unreachable from %s' % (STOP_STATE, initial_state))
+        return problems
+
+    def reachable(self, initial_state: str) -> set:
+        """Returns the states reachable from `initial_state` by the rules."""
+        rows = {self.state_codes[q] * self.width: q for q in self.states}
+        reachable = {initial_state}
+        queue = [initial_state]
+        while queue:
+            code = self.state_codes.get(queue.pop())
+            if code is None:
+                continue
+            row = code * self.width
+            for entry in self.table[row:row + self.width]:
+                if entry is not None and rows[entry[2]] not in reachable:
+                    reachable.add(rows[entry[2]])
+                    queue.append(rows[entry[2]])
+        return reachable
+
+    def __sweeps(self) -> tuple:
+        """Builds the sweeps table, see the class description."""
+        sweeps = [None] * len(self.table)
+        for row in range(0, len(self.table), self.width):
+            for delta in (-1, 1):
+                codes = [
+                    code for code in range(self.width)
+                    if self.table[row + code] is not None and self.table[row + code][1:] == (delta, row)
+                ]
+                translation = bytearray(range(256))
+                for code in codes:
+                    translation[code] = self.table[row + code][0]
+
+                sweep = (delta, bytes(codes), bytes(translation))
+                for code in codes:
+                    sweeps[row + code] = sweep
+        return tuple(sweeps)
@@ -19,10 +19,51 @@ SUCCESSFUL_STATUS = "successful"
 """Result status of a machine run, means machine has stopped."""
 MAX_ITERATIONS_REACHED_STATUS = "max iterations reached"
 """Result status of a machine run, means machine needs more tacts to proceed."""
+LOOP_DETECTED_STATUS = "loop detected"
+"""Result status of a machine run, means machine has come to the same configuration twice and will never stop."""
+TIME_LIMIT_STATUS = "time limit reached"
+"""Result status of a machine run, means machine hasn't stopped by the deadline."""
+TAPE_LIMIT_STATUS = "tape limit reached"
+"""Result status of a machine run, means written part of the tape has got longer than allowed."""
 MAX_ITERATIONS = 9999
 """The tacts limit for a machine run."""
+LOOP_MEMORY = 1024
+"""How many configuration fingerprints are kept at most when looking for loops."""
 
 NORMAL_MODE = "normal"
 """When machine runs, do not save information about every step."""
 BY_STEP_MODE = "by step"
 """When machine runs, do save information about every step."""
+ACCELERATED_MODE = "accelerated"
+"""When machine runs, do sweeps of a state over the tape in one operation, do not save information about every step."""
+
+DICT_TAPE = "dict"
+"""Tape engine storing written cells in a dictionary, good for sparse tapes."""
+ARRAY_TAPE = "array"
+"""Tape engine storing cells as symbol codes in a contiguous buffer, good for long dense tapes."""
+PERSISTENT_TAPE = "persistent"
+"""Tape engine storing cells in pages shared between forks of the tape, good for branching searches."""
+
+CHECKPOINT_TACTS = 1000000
+"""How many tacts a machine does between checkpoints by default."""
+LIMITS_TACTS = 65536
+"""How many tacts a machine does between checks of time and tape limits by default."""
+RUN_WINDOW = 4096
+"""How many cells on each side of the head a run on compiled rules loads at first, more are loaded as the head leaves them."""
+HISTORY_CHECKPOINT_TACTS = 1024
+"""How many tacts a machine does between checkpoints of its history by default."""
+HISTORY_BUDGET = 1000000
+"""How many tacts the history of a machine run keeps at most by default."""
+HISTORY_CHECKPOINT_CELLS = 16 * 1024 * 1024
+"""How many tape cells the checkpoints of the history of a machine run keep at most by default."""
+
+ACCEPTED_STATUS = "accepted"
+"""Result status of a nondeterministic machine run, means one of the branches has stopped."""
+REJECTED_STATUS = "rejected"
+"""Result status of a nondeterministic machine run, means all the branches have died without stopping."""
+FRONTIER_LIMIT_STATUS = "frontier limit reached"
+"""Result status of a nondeterministic machine run, means there are more configurations at a depth than allowed."""
+FRONTIER_LIMIT = 100000
+"""How many configurations of one depth a nondeterministic machine run keeps at most by default."""
+PARALLEL_FRONTIER = 1000
+"""How many configurations there must be at a depth to expand them in worker processes."""
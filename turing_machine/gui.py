@@ -5,23 +5,191 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import font
 from .turing_machine import TuringMachine
-from .constants import LAMBDA
+from .constants import LAMBDA, STOP_STATE
+from .compiler import parse_rule
+from .history import History
 import os
 import gettext
+import time
+
+
+class TapeView(tk.Canvas):
+    """Shows a window of a tape of any length, redrawing only the cells which change.
+
+    The window is scrolled by the mouse wheel, by a scrollbar connected
+    through :meth:`xview` and `xscrollcommand`, or to a given cell. A cell
+    clicked is selected, and a character typed is written into it.
+
+    :param machine: the machine whose tape and head to show
+    :param edit: function called with index of the selected cell and typed character, returns whether the character is written
+    """
+    cell_width = 24
+    """Width of a tape cell in pixels."""
+    cell_height = 28
+    """Height of a tape cell in pixels."""
+
+    def __init__(self, parent, machine: TuringMachine, edit, xscrollcommand=None, **kwargs):
+        super().__init__(parent, height=self.cell_height + 2, highlightthickness=0, takefocus=1, **kwargs)
+        self.model = machine
+        self.edit = edit
+        self.scroll_command = xscrollcommand
+        self.normal = font.nametofont('TkDefaultFont')
+        self.bold = font.Font(weight='bold')
+
+        self.start = machine.position
+        self.selected = None
+        self.cells = []
+        self.shown = []
+
+        self.bind('<Configure>', self.__resize)
+        self.bind('<Button-1>', self.__click)
+        self.bind('<Key>', self.__key)
+        self.bind('<MouseWheel>', lambda event: self.xview('scroll', -1 if event.delta > 0 else 1, 'units'))
+        self.bind('<Button-4>', lambda event: self.xview('scroll', -1, 'units'))
+        self.bind('<Button-5>', lambda event: self.xview('scroll', 1, 'units'))
+
+    def __resize(self, event):
+        """Create or delete cells to fill the new width."""
+        size = event.width // self.cell_width + 1
+        first = not self.cells
+        while len(self.cells) > size:
+            for item in self.cells.pop():
+                self.delete(item)
+            self.shown.pop()
+        while len(self.cells) < size:
+            x = len(self.cells) * self.cell_width + 1
+            self.cells.append((
+                self.create_rectangle(x, 1, x + self.cell_width, self.cell_height + 1),
+                self.create_text(x + self.cell_width // 2, self.cell_height // 2 + 1)
+            ))
+            self.shown.append(None)
+        if first:
+            self.start = self.model.position - size // 2
+        self.redraw()
+
+    def __click(self, event):
+        """Select the cell clicked."""
+        self.focus_set()
+        self.selected = self.start + int(self.canvasx(event.x)) // self.cell_width
+        self.redraw()
+
+    def __key(self, event):
+        """Write the typed character into the selected cell, or move the selection."""
+        if self.selected is None:
+            return
+        if event.keysym in ('Left', 'Right'):
+            self.selected += -1 if event.keysym == 'Left' else 1
+            self.show(self.selected, center=False)
+            return
+        char = LAMBDA if event.keysym in ('BackSpace', 'Delete', 'space') else event.char
+        if len(char) == 1 and self.edit(self.selected, char):
+            self.selected += 1
+            self.show(self.selected, center=False)
+
+    def bounds(self) -> tuple:
+        """Returns the first and after the last cells which can be scrolled to: the written ones, the head and the window."""
+        left, right = self.model.tape.bounds
+        if left == right:
+            left, right = self.model.position, self.model.position + 1
+        return (
+            min(left, self.model.position, self.start) - len(self.cells) // 2,
+            max(right, self.model.position + 1, self.start + len(self.cells)) + len(self.cells) // 2
+        )
+
+    def redraw(self):
+        """Update the cells which show something else than before."""
+        head, tape = self.model.position, self.model.tape
+        for i, (rectangle, text) in enumerate(self.cells):
+            index = self.start + i
+            shown = tape[index], index == head, index == self.selected
+            if self.shown[i] == shown:
+                continue
+            self.shown[i] = shown
+            char, is_head, is_selected = shown
+            self.itemconfigure(text, text=char, font=self.bold if is_head else self.normal)
+            self.itemconfigure(
+                rectangle, fill='#ffe082' if is_head else 'white',
+                outline='#1e88e5' if is_selected else 'black', width=2 if is_selected else 1
+            )
+
+        if self.scroll_command is not None:
+            lo, hi = self.bounds()
+            self.scroll_command((self.start - lo) / (hi - lo), (self.start + len(self.cells) - lo) / (hi - lo))
+
+    def xview(self, *args):
+        """Scroll the window as asked by a scrollbar: ``('moveto', fraction)`` or ``('scroll', number, 'units' or 'pages')``."""
+        if not args:
+            lo, hi = self.bounds()
+            return (self.start - lo) / (hi - lo), (self.start + len(self.cells) - lo) / (hi - lo)
+        if args[0] == 'moveto':
+            lo, hi = self.bounds()
+            self.start = lo + round(float(args[1]) * (hi - lo))
+        elif args[0] == 'scroll':
+            self.start += int(args[1]) * (max(len(self.cells) - 1, 1) if args[2] == 'pages' else 1)
+        self.redraw()
+
+    def show(self, index: int, center: bool = True):
+        """Scroll the window to show the cell.
+
+        :param center: whether to put the cell in the middle of the window, or to scroll only if it's out of it
+        """
+        if center or not self.start <= index < self.start + len(self.cells) - 1:
+            self.start = index - len(self.cells) // 2
+        self.redraw()
+
+    def show_head(self):
+        """Scroll the window to the head."""
+        self.show(self.model.position)
+
+    def show_left(self):
+        """Scroll the window to the first written cell."""
+        left, right = self.model.tape.bounds
+        self.start = left if left < right else self.model.position
+        self.redraw()
+
+    def show_right(self):
+        """Scroll the window to the last written cell."""
+        left, right = self.model.tape.bounds
+        self.start = (right if left < right else self.model.position + 1) - len(self.cells)
+        self.redraw()
+
+    def follow(self):
+        """Redraw the window, scrolling it if the head has left it."""
+        self.show(self.model.position, center=False)
+
+
+class RuleRow:
+    """Widgets of the rules table row of a state.
+
+    :param state: the state, kept up to date when it's renamed
+    :param row: the grid row
+    """
+    def __init__(self, state: str, row: int):
+        self.state = state
+        self.row = row
+        self.widgets = []
+        self.entries = {}
+        self.heat = {}
 
 
 class View(ttk.Frame):
     """Defines graphical user interface."""
+    heat_colors = ('#fff3e0', '#ffe0b2', '#ffcc80', '#ffa726', '#ff7043')
+    """Backgrounds of rule entries from rarely to most often applied rules."""
+
     def __init__(self, machine: TuringMachine):
         super().__init__(None)
         self.master.title(_('Turing Machine Emulator'))
         self.master.columnconfigure(0, weight=1)
         self.master.rowconfigure(0, weight=1)
-        self.tape_size = 17
 
         self.model = machine
         self.controller = Controller(self, machine)
 
+        self.style = ttk.Style(self.master)
+        for level, color in enumerate(self.heat_colors):
+            self.style.configure('Heat%d.TEntry' % level, fieldbackground=color)
+
         self.grid(sticky="NEWS")
         self.__create_widgets()
         self.__set_weight(self)
@@ -49,24 +217,13 @@ class View(ttk.Frame):
 
     def __create_widgets(self):
         """Create all the widgets."""
-        self.bold = font.Font(weight='bold')
-
         self.tape_frame = self.__new_widget(ttk.Frame, 0, 0)
-        self.tape = []
-        for i in range(self.tape_size):
-            def to_reg(i=i):
-                return self.controller._tape_check(i)
-            vc = self.register(to_reg)
-            a = self.__new_widget(
-                ttk.Entry, 0, i, parent=self.tape_frame,
-                width=1, justify='center',
-                textvariable=self.controller.tape[i],
-                validate='focusout', validatecommand=vc
-            )
-            self.tape.append(a)
-        i = self.model.position - self.controller.tape_start
-        if 0 <= i < self.tape_size:
-            self.tape[i]['font'] = self.bold
+        self.tape = self.__new_widget(TapeView, 0, 0, colspan=3, parent=self.tape_frame, machine=self.model, edit=self.controller._tape_edit)
+        scrollbar = self.__new_widget(ttk.Scrollbar, 1, 0, colspan=3, parent=self.tape_frame, orient='horizontal', command=self.tape.xview)
+        self.tape.scroll_command = scrollbar.set
+        self.__new_widget(ttk.Button, 2, 0, parent=self.tape_frame, text=_('Tape start'), command=self.tape.show_left)
+        self.__new_widget(ttk.Button, 2, 1, parent=self.tape_frame, text=_('Head'), command=self.tape.show_head)
+        self.__new_widget(ttk.Button, 2, 2, parent=self.tape_frame, text=_('Tape end'), command=self.tape.show_right)
         self.__set_weight(self.tape_frame)
 
         machine_settings = self.__new_widget(ttk.Frame, 1, 0)
@@ -81,68 +238,142 @@ class View(ttk.Frame):
         self.tacts = self.__new_widget(ttk.Label, 0, 1, parent=machine_settings, textvariable=self.controller.tacts)
         self.make_step = self.__new_widget(ttk.Button, 0, 3, parent=machine_settings, text=_('Step'), command=self.controller._step)
         self.go = self.__new_widget(ttk.Button, 0, 2, parent=machine_settings, text=_('Go'), command=self.controller._go)
+        self.stop = self.__new_widget(ttk.Button, 0, 4, parent=machine_settings, text=_('Stop'), command=self.controller._stop, state='disabled')
+        self.back = self.__new_widget(ttk.Button, 0, 5, parent=machine_settings, text=_('Back'), command=self.controller._step_back)
+        self.seek_tact = self.__new_widget(ttk.Entry, 0, 6, parent=machine_settings, textvariable=self.controller.seek_tact, width=8)
+        self.seek = self.__new_widget(ttk.Button, 0, 7, parent=machine_settings, text=_('Seek'), command=self.controller._seek)
 
         self.__set_weight(machine_settings)
 
-        self.rules = self.__new_widget(ttk.Frame, 2, 0)
-        self.controller._update_rules()
+        self.__create_rules()
+
+        self.problems = self.__new_widget(ttk.Label, 3, 0, textvariable=self.controller.problems, foreground='red')
 
-        file_io = self.__new_widget(ttk.Frame, 3, 0)
+        file_io = self.__new_widget(ttk.Frame, 4, 0)
         self.load = self.__new_widget(ttk.Button, 0, 0, parent=file_io, text=_('Load'))
         self.save = self.__new_widget(ttk.Button, 0, 1, parent=file_io, text=_('Save'))
         self.__set_weight(file_io)
 
-    def _update_rules(self):
-        """Recreate the rules table."""
-        self.rules.destroy()
+    def __create_rules(self):
+        """Create the rules table."""
         self.rules = self.__new_widget(ttk.Frame, 2, 0)
+        self.rule_rows = {}
+        self.next_row = 1
+        self.columns = {}
+        self.char_labels = {}
         self.__new_widget(ttk.Label, 0, 0, colspan=2, parent=self.rules, text=_('States \\ Chars'))
 
+        vc = self.register(lambda: self.controller._state_check(''))
+        self.new_state = self.__new_widget(
+            ttk.Entry, 1, 1, parent=self.rules,
+            textvariable=self.controller.rules[''], validate='focusout',
+            validatecommand=vc
+        )
+        self._update_columns()
+        for s in self.model.rules:
+            self._add_state(s)
+
+    def __rule_entry(self, row: RuleRow, c: str):
+        """Create an entry for the rule of the row's state and the character."""
+        def to_reg():
+            return self.controller._rule_check(row.state, c)
+
+        vc = self.register(to_reg)
+        row.entries[c] = self.__new_widget(
+            ttk.Entry, row.row, self.columns[c], parent=self.rules,
+            textvariable=self.controller.rules[row.state, c], validate='focusout',
+            validatecommand=vc
+        )
+
+    def _update_columns(self):
+        """Add and remove columns of the rules table for characters added to and removed from the alphabet, put them in its order."""
+        for c in [c for c in self.columns if c not in self.model.alphabet]:
+            del self.columns[c]
+            self.char_labels.pop(c).destroy()
+            for row in self.rule_rows.values():
+                row.entries.pop(c).destroy()
+                row.heat.pop(c, None)
+
         for j, c in enumerate(self.model.alphabet):
-            self.__new_widget(ttk.Label, 0, j + 2, parent=self.rules, text=c)
-        for i, s in enumerate(self.model.rules):
-            def to_reg1(s=s):
-                return self.controller._delete_state(s)
-            vc = self.register(to_reg1)
-            self.__new_widget(ttk.Button, i + 1, 0, parent=self.rules, text='x', command=vc)
+            column = j + 2
+            if c not in self.columns:
+                self.columns[c] = column
+                self.char_labels[c] = self.__new_widget(ttk.Label, 0, column, parent=self.rules, text=c)
+                for row in self.rule_rows.values():
+                    self.__rule_entry(row, c)
+            elif self.columns[c] != column:
+                self.columns[c] = column
+                self.char_labels[c].grid(column=column)
+                for row in self.rule_rows.values():
+                    row.entries[c].grid(column=column)
+        self.__set_weight(self.rules)
 
-            def to_reg(s=s):
-                return self.controller._state_check(s)
+    def _add_state(self, s: str):
+        """Add a row to the rules table for a new state."""
+        row = RuleRow(s, self.next_row)
+        self.next_row += 1
 
-            vc = self.register(to_reg)
+        vc = self.register(lambda: self.controller._state_check(row.state))
+        row.widgets = [
+            self.__new_widget(ttk.Button, row.row, 0, parent=self.rules, text='x', command=lambda: self.controller._delete_state(row.state)),
             self.__new_widget(
-                ttk.Entry, i + 1, 1, parent=self.rules,
+                ttk.Entry, row.row, 1, parent=self.rules,
                 width=5, justify='center',
                 textvariable=self.controller.rules[s],
                 validate='focusout',
                 validatecommand=vc
             )
-            for j, c in enumerate(self.model.alphabet):
-                def to_reg(s=s, c=c):
-                    return self.controller._rule_check(s, c)
-                vc = self.register(to_reg)
-                self.__new_widget(
-                    ttk.Entry, i + 1, j + 2, parent=self.rules,
-                    textvariable=self.controller.rules[s, c], validate='focusout',
-                    validatecommand=vc
-                )
-
-        lll = len(self.model.rules)
+        ]
+        for c in self.model.alphabet:
+            self.__rule_entry(row, c)
+        self.rule_rows[s] = row
 
-        def to_reg(s=''):
-            return self.controller._state_check(s)
-
-        vc = self.register(to_reg)
-        self.__new_widget(
-            ttk.Entry, 1 + lll, 1, parent=self.rules,
-            textvariable=self.controller.rules[''], validate='focusout',
-            validatecommand=vc
-        )
+        self.new_state.grid(row=self.next_row)
         self.__set_weight(self.rules)
+        self._update_heat()
+
+    def _remove_state(self, s: str):
+        """Remove the row of a deleted state from the rules table."""
+        row = self.rule_rows.pop(s)
+        for widget in row.widgets + list(row.entries.values()):
+            widget.destroy()
+        self.rules.rowconfigure(row.row, weight=0)
+
+    def _rename_state(self, old: str, new: str):
+        """Move the row of a renamed state to the new name."""
+        row = self.rule_rows.pop(old)
+        row.state = new
+        self.rule_rows[new] = row
+
+    def _set_running(self, running: bool):
+        """Enable buttons available while the machine runs or while it doesn't."""
+        self.go['state'] = 'disabled' if running else 'normal'
+        self.make_step['state'] = 'disabled' if running else 'normal'
+        self.back['state'] = 'disabled' if running else 'normal'
+        self.seek['state'] = 'disabled' if running else 'normal'
+        self.stop['state'] = 'normal' if running else 'disabled'
+
+    def _update_heat(self):
+        """Color the rules table by how many times every rule was applied."""
+        hits = self.controller.hits
+        most = max((n for line in hits.values() for n in line.values()), default=0)
+        for row in self.rule_rows.values():
+            line = hits.get(row.state, {})
+            for c, entry in row.entries.items():
+                n = line.get(c, 0)
+                style = 'Heat%d.TEntry' % ((len(self.heat_colors) - 1) * n // most) if n else 'TEntry'
+                if row.heat.get(c, 'TEntry') != style:
+                    row.heat[c] = style
+                    entry['style'] = style
 
 
 class Controller:
     """Stores and manipulates control variables for view–model communication."""
+    chunk_seconds = 0.02
+    """How long the machine runs at once, while the window doesn't respond."""
+    refresh_seconds = 0.1
+    """How often the tape is redrawn during a run."""
+
     def __init__(self, view: View, machine: TuringMachine):
         """
         :param view: widgets to work with
@@ -154,76 +385,65 @@ class Controller:
         self.alphabet = tk.StringVar()
         self.alphabet.set(self.model.alphabet[:-1])
 
-        self.radius = self.view.tape_size // 2
-        self.tape_start = self.model.position - self.radius
-
-        self.tape = {}
-        for i in range(self.view.tape_size):
-            self.tape[self.model.position + i] = tk.StringVar()
-            self.tape[self.model.position + i].set(self.model.tape[self.tape_start + i])
-
         self.tacts_counter = 0
         self.tacts_title = _("Tacts: ")
         self.tacts = tk.StringVar()
         self.tacts.set(self.tacts_title + str(self.tacts_counter))
 
         self.stashed = dict()
+        self.hits = dict()
+        self.problems = tk.StringVar()
+
+        self.rules = {'': tk.StringVar()}  # '' for new state
+        for s in self.model.rules:
+            self.__add_state_vars(s)
+        self._update_problems()
+
+        self.history = History(machine)
+        self.seek_tact = tk.StringVar()
+        self.seek_tact.set('0')
 
-    def _tape_check(self, i: int):
+        self.running = False
+        self.target = None
+        self.refreshed = 0
+        self.chunk = 1000
+
+    def _tape_edit(self, index: int, char: str):
         """Check change to the tape.
 
-        :param i: index of changed cell
+        :param index: index of changed cell
+        :param char: the character to write into it
         """
-        old = self.model.tape[self.tape_start + i]
-        new = self.tape[i].get()
-        if new == old:
-            return False
-        if len(new) == 0:  # XXX keep this feature?
-            self.model.tape[self.tape_start + i] = LAMBDA
-            self.tape[i].set(LAMBDA)
-            return True
-        if len(new) != 1 or new not in self.model.alphabet:
-            self.tape[i].set(old)
+        if char not in self.model.alphabet:
             return False
-        self.model.tape[self.tape_start + i] = new
+        self.model.tape[index] = char
+        self.history.clear()
+        self.view.tape.redraw()
         return True
 
-    def _update_rules(self, remove=''):
-        """Add or remove entries for rules.
-
-        :param remove: characters to remove from machine model as they are removed from the alphabet
-        :type remove: container of characters
-        """
-
-        def new_var(s: str, c: str):
-            result = tk.StringVar()
-            if c is None:
-                result.set(s)
-                return result
-            result.set(self.model.rules.get(s, {}).get(c, '') or self.stashed.get((s, c), ''))
-            return result
-
-        self.rules = {
-            (s, c): new_var(s, c)
-            for s in self.model.rules.keys()
-            for c in self.model.alphabet
-        }
-        self.rules.update({
-            s: new_var(s, None)
-            for s in self.model.rules
-        })
-        self.rules[''] = tk.StringVar()  # for new state
-
-        for state, line in self.model.rules.items():
-            for c in remove:
-                self.stashed[state, c] = line.pop(c, '')
+    def __new_var(self, s: str, c: str):
+        """Create variable for the rule of the state and the character."""
+        result = tk.StringVar()
+        result.set(self.model.rules.get(s, {}).get(c, '') or self.stashed.get((s, c), ''))
+        return result
 
-        self.view._update_rules()
+    def __add_state_vars(self, s: str):
+        """Create variables for name and rules of the state."""
+        self.rules[s] = tk.StringVar()
+        self.rules[s].set(s)
+        for c in self.model.alphabet:
+            self.rules[s, c] = self.__new_var(s, c)
 
     def _delete_state(self, s: str):
         """Remove the state from the machine."""
         self.model.rules.pop(s)
-        self._update_rules()
+        self.hits.pop(s, None)
+        self.rules.pop(s)
+        for c in self.model.alphabet:
+            self.rules.pop((s, c))
+        self.view._remove_state(s)
+        self.history.clear()
+        self._update_problems()
 
     def _state_check(self, s: str):
         """Check state name to be unique.
@@ -234,13 +454,31 @@ class Controller:
         new = self.rules[s].get()
         if new == old:
             return False
-        if new in self.model.rules:
+        if new in self.model.rules or new == '':
             self.rules[s].set(s)
             return False
-        assert(old == '' or old in self.model.rules)
-        line = self.model.rules.pop(old, dict())
-        self.model.rules[new] = line
-        self._update_rules()
+        assert old == '' or old in self.model.rules
+        if old == '':
+            self.model.rules[new] = dict()
+            self.rules[''].set('')
+            self.__add_state_vars(new)
+            self.view._add_state(new)
+        else:
+            lines = list(self.model.rules.items())
+            self.model.rules.clear()
+            self.model.rules.update((new if q == old else q, line) for q, line in lines)
+            self.rules[new] = self.rules.pop(old)
+            for c in self.model.alphabet:
+                self.rules[new, c] = self.rules.pop((old, c))
+            if old in self.hits:
+                self.hits[new] = self.hits.pop(old)
+            if self.model.state == old:
+                self.model.state = new
+            if self.model.initial_state == old:
+                self.model.initial_state = new
+            self.view._rename_state(old, new)
+            self.history.clear()
+        self._update_problems()
         return True
 
     def _rule_check(self, state: str, char: str):
@@ -248,16 +486,22 @@ class Controller:
 
         :param state: state
         """
-        from re import split
-        result = split(r'[,\s]+', self.rules[state, char].get())
-        if len(result) != 3 or result[0] not in self.model.alphabet or result[1] not in 'nrlNRL' or '!' != result[2] not in self.model.rules:
+        try:
+            rule = parse_rule(self.rules[state, char].get(), self.model.alphabet, self.model.rules)
+        except ValueError:
             old = self.model.rules[state].get(char, '')
             if old:
                 self.rules[state, char].set(old)
             return False
-        self.model.rules[state][char] = result
+        self.model.rules[state][char] = rule
+        self.history.clear()
+        self._update_problems()
         return True
 
+    def _update_problems(self):
+        """Show what is wrong with the rules."""
+        self.problems.set('\n'.join(self.model.problems()))
+
     def _alphabet_check(self):
         """Check the alphabet entry to consist of unique symbols."""
         old = self.model.alphabet
@@ -268,33 +512,124 @@ class Controller:
             new += LAMBDA
             self.model.alphabet = new
             self.model.tape.filter(new)
-            self._update_rules([c for c in old if c not in new])
-            self.tape_start = self.model.position - self.radius
-            for i, v in self.tape.items():
-                v.set(self.model.tape[self.tape_start + i])
+            for state, line in self.model.rules.items():
+                for c in old:
+                    if c not in new:
+                        self.stashed[state, c] = line.pop(c, '')
+                        self.rules.pop((state, c))
+                for c in new:
+                    if c not in old:
+                        self.rules[state, c] = self.__new_var(state, c)
+            self.view._update_columns()
+            self.history.clear()
+            self._update_problems()
+            self.view.tape.redraw()
             return True
         self.alphabet.set(old[:-1])
         return False
 
     def _step(self):
         """Advance the Turing machine one tact."""
-        result = self.model.run(max_tacts=1)
-        self.__update_tape(result)
+        result = self.model.run(max_tacts=1, profile=True, history=self.history)
+        self.__count(result)
+        self.__update_tape()
+
+    def _step_back(self):
+        """Undo the last tact of the Turing machine, if it's still in the history."""
+        if not self.history.step_back():
+            return
+        line = self.hits.get(self.model.state, {})
+        c = self.model.tape[self.model.position]
+        if line.get(c):
+            line[c] -= 1
+        self.tacts_counter -= 1
+        self.tacts.set(self.tacts_title + str(self.tacts_counter))
+        self.__update_tape()
+
+    def _seek(self):
+        """Put the Turing machine into its configuration at the tact entered, running it further if needed.
+
+        A tact ahead is reached by :meth:`_go` stopping there. Seeking back,
+        the rules heatmap starts over, as the tacts skipped aren't profiled.
+        """
+        before = self.model.tacts
+        try:
+            tact = int(self.seek_tact.get())
+            if tact > before:
+                self.target = tact
+                self._go()
+                return
+            self.history.seek(tact)
+        except ValueError:
+            self.seek_tact.set(str(self.model.tacts))
+            return
+        self.hits.clear()
+        self.tacts_counter += self.model.tacts - before
+        self.tacts.set(self.tacts_title + str(self.tacts_counter))
+        self.__update_tape()
 
     def _go(self):
-        """Run the Turing machine till it stops or tacts limit exceeds."""
-        result = self.model.run()
-        self.__update_tape(result)
-
-    def __update_tape(self, result):
-        """Update the tape."""
-        if result['iterations'] == 0:
-            return  # the machine has stopped
+        """Run the Turing machine in chunks till it stops or :meth:`_stop` is called, keeping the window responsive."""
+        if self.running:
+            return
+        self.running = True
+        self.refreshed = time.perf_counter()
+        self.view._set_running(True)
+        self.view.after_idle(self.__go_chunk)
+
+    def _stop(self):
+        """Stop the run started by :meth:`_go` after the current chunk."""
+        self.target = None
+        if self.running:
+            self.running = False
+            self.view._set_running(False)
+            self.__update_tape()
+
+    def __go_chunk(self):
+        """Run the machine for one chunk of tacts and schedule the next one.
+
+        The chunk is sized for a run to take about :attr:`chunk_seconds`, so the
+        window gets a chance to process events at a steady rate. The machine
+        is consistent between chunks, so a run can be stopped at any of them.
+        A run started by :meth:`_seek` stops at its target tact.
+        """
+        if not self.running:
+            return
+        max_tacts = self.chunk if self.target is None else min(self.chunk, self.target - self.model.tacts)
+        start = time.perf_counter()
+        try:
+            result = self.model.run(max_tacts=max_tacts, profile=True, history=self.history)
+        except KeyError:
+            self._stop()
+            raise
+        now = time.perf_counter()
+        self.__count(result)
+
+        elapsed = now - start
+        ratio = self.chunk_seconds / elapsed if elapsed > 0 else 2
+        self.chunk = max(1, int(self.chunk * min(max(ratio, 0.5), 2)))
+
+        if self.model.state == STOP_STATE or result['iterations'] == 0 or self.model.tacts == self.target:
+            self._stop()
+            return
+        if now - self.refreshed >= self.refresh_seconds:
+            self.refreshed = now
+            self.__update_tape()
+        self.view.after(1, self.__go_chunk)
+
+    def __count(self, result):
+        """Add tacts and rule hits of a run to the counters."""
         self.tacts_counter += result['iterations']
         self.tacts.set(self.tacts_title + str(self.tacts_counter))
-        self.tape_start = self.model.position - self.radius
-        for i, v in self.tape.items():
-            v.set(self.model.tape[self.tape_start + i])
+        for s, line in result['profile']['rules'].items():
+            counts = self.hits.setdefault(s, {})
+            for c, n in line.items():
+                counts[c] = counts.get(c, 0) + n
+
+    def __update_tape(self):
+        """Update the tape and the rules heatmap."""
+        self.view._update_heat()
+        self.view.tape.follow()
 
 
 def main():
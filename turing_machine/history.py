@@ -0,0 +1,124 @@
+"""
+History of Turing machine runs, used to step back and to seek to any tact.
+"""
+from collections import deque
+from itertools import islice
+from turing_machine.compiler import MOVE_DELTAS
+from turing_machine.constants import HISTORY_CHECKPOINT_TACTS, HISTORY_BUDGET, HISTORY_CHECKPOINT_CELLS
+
+
+class History:
+    """Records a machine run to go back and forth in it.
+
+    Every tact is kept in the undo log as the head position, the character
+    under the head and the state before it, so :meth:`step_back` takes O(1)
+    time. Every `checkpoint_tacts` tacts a :class:`~turing_machine.snapshot.Snapshot`
+    is taken, so :meth:`seek` either undoes tacts or restores the closest
+    checkpoint and replays the rest, whichever is shorter, in
+    O(`checkpoint_tacts`) time.
+
+    The log keeps at most `budget` tacts: older ones are forgotten together
+    with their checkpoints. The checkpoints keep at most `checkpoint_cells`
+    tape cells: older ones are forgotten first, and the tacts before the
+    oldest one left are reached by undoing. So memory doesn't depend on the
+    length of the run or the size of the tape.
+
+    Tacts are recorded by passing the history to
+    :meth:`~turing_machine.turing_machine.TuringMachine.run`. After the
+    machine is changed otherwise, e.g. its tape is edited, the history has to
+    be :meth:`clear`-ed.
+
+    :param machine: the machine to record
+    :param checkpoint_tacts: how many tacts to do between checkpoints
+    :param budget: how many tacts to keep in the undo log at most
+    :param checkpoint_cells: how many tape cells to keep in the checkpoints at most
+    """
+    def __init__(self, machine, checkpoint_tacts: int = HISTORY_CHECKPOINT_TACTS, budget: int = HISTORY_BUDGET, checkpoint_cells: int = HISTORY_CHECKPOINT_CELLS):
+        self.machine = machine
+        self.checkpoint_tacts = max(checkpoint_tacts, 1)
+        self.budget = max(budget, 0)
+        self.checkpoint_cells = max(checkpoint_cells, 0)
+        self.clear()
+
+    def clear(self):
+        """Forget the history, so that it starts from the current configuration of the machine."""
+        self.undo = deque()
+        self.start = self.machine.tacts
+        self.checkpoints = deque()
+        self.cells = 0
+        self.__checkpoint()
+
+    def __checkpoint(self):
+        """Takes a checkpoint, forgetting the oldest ones if they take too many cells."""
+        snapshot = self.machine.snapshot()
+        self.checkpoints.append(snapshot)
+        self.cells += len(snapshot.tape)
+        while self.checkpoints and self.cells > self.checkpoint_cells:
+            self.cells -= len(self.checkpoints.popleft().tape)
+
+    def __forget_last(self):
+        """Forgets the latest checkpoint."""
+        self.cells -= len(self.checkpoints.pop().tape)
+
+    def step(self, step) -> bool:
+        """Records a tact the machine has just done, returns false (to be used as a step observer).
+
+        :param step: :class:`~turing_machine.turing_machine.Step` of the tact
+        """
+        machine = self.machine
+        self.undo.append((machine.position - MOVE_DELTAS.get(step.move, 0), step.curr_character, step.curr_state))
+        if machine.tacts % self.checkpoint_tacts == 0:
+            self.__checkpoint()
+
+        if len(self.undo) > self.budget:
+            self.undo.popleft()
+            self.start += 1
+            while self.checkpoints and self.checkpoints[0].tacts < self.start:
+                self.cells -= len(self.checkpoints.popleft().tape)
+        return False
+
+    def step_back(self) -> bool:
+        """Undo the last tact, returns whether there was one to undo."""
+        if not self.undo:
+            return False
+        machine = self.machine
+        position, c, q = self.undo.pop()
+        machine.tape[position] = c
+        machine.position = position
+        machine.state = q
+        machine.tacts -= 1
+        if self.checkpoints and self.checkpoints[-1].tacts > machine.tacts:
+            self.__forget_last()
+        return True
+
+    def seek(self, tact: int):
+        """Put the machine into its configuration at the tact.
+
+        A tact after the current one is reached by running the machine
+        further, so it may stop earlier.
+
+        :raises ValueError: if the tact is forgotten or was never recorded
+        """
+        machine = self.machine
+        if tact < self.start:
+            raise ValueError(f'tact {tact} is before the start of the history at {self.start}')
+        if tact >= machine.tacts:
+            machine.run(max_tacts=tact - machine.tacts, history=self)
+            return
+
+        checkpoint = next((snapshot for snapshot in reversed(self.checkpoints) if snapshot.tacts <= tact), None)
+        if checkpoint is None or machine.tacts - tact <= tact - checkpoint.tacts:
+            while machine.tacts > tact:
+                self.step_back()
+            return
+
+        keep = checkpoint.tacts - self.start
+        if keep < len(self.undo) // 2:
+            self.undo = deque(islice(self.undo, keep))
+        else:
+            for _ in range(len(self.undo) - keep):
+                self.undo.pop()
+        while self.checkpoints[-1].tacts > checkpoint.tacts:
+            self.__forget_last()
+        machine.restore(checkpoint)
+        machine.run(max_tacts=tact - checkpoint.tacts, history=self)
@@ -0,0 +1,79 @@
+"""
+Detection of Turing machines looping forever.
+
+A machine which comes to the same configuration (state, head position and
+tape) twice will repeat it forever. Configurations are compared by
+:meth:`~turing_machine.turing_machine.TuringMachine.fingerprint`, which is
+updated in O(1) on every write to the tape.
+"""
+
+
+class LoopDetector:
+    """Watches a machine run for a repeated configuration using bounded memory.
+
+    Fingerprints of configurations are remembered every `stride` tacts. When
+    more than `memory` of them are kept, the stride is doubled and every other
+    fingerprint is forgotten. Every configuration is looked up among the
+    remembered ones, so a loop is found at most `stride` tacts plus one loop
+    period after the machine enters it.
+
+    :param machine: the machine to watch, in its configuration at the start of the run
+    :param memory: how many fingerprints to keep at most, at least 2 are kept to find loops not starting at the first tact
+    """
+    def __init__(self, machine, memory: int):
+        self.machine = machine
+        self.memory = max(memory, 2)
+        self.start = machine.snapshot()
+        self.tacts = 0
+        self.stride = 1
+        self.seen = {machine.fingerprint(): 0}
+        self.period = None
+        self.repeated = None
+
+    def step(self) -> bool:
+        """Registers a tact of the machine, returns whether it has come to a remembered configuration."""
+        self.tacts += 1
+
+        fingerprint = self.machine.fingerprint()
+        tact = self.seen.get(fingerprint)
+        if tact is not None:
+            self.period = self.tacts - tact
+            self.repeated = tact
+            return True
+
+        if self.tacts % self.stride == 0:
+            self.seen[fingerprint] = self.tacts
+            if len(self.seen) > self.memory:
+                self.stride *= 2
+                self.seen = {key: tact for key, tact in self.seen.items() if tact % self.stride == 0}
+        return False
+
+    def loop_start(self) -> int:
+        """Returns the first tact of the loop found.
+
+        The machine is replayed from the start of the run on a copy: whether
+        configurations at tacts `k` and `k + period` are equal only changes
+        from false to true at the loop start, so it's found by binary search.
+        This also verifies the loop, so a fingerprint collision is reported
+        as :class:`ValueError`.
+        """
+        probe = type(self.machine)(**self.machine.config())
+
+        def repeats(tacts: int) -> bool:
+            probe.restore(self.start)
+            probe.run(max_tacts=tacts)
+            configuration = probe.snapshot()._replace(tacts=0)
+            probe.run(max_tacts=self.period)
+            return probe.snapshot()._replace(tacts=0) == configuration
+
+        if not repeats(self.repeated):
+            raise ValueError('fingerprints of different configurations collided')
+
+        lo, hi = 0, self.repeated
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if repeats(middle):
+                hi = middle
+            else:
+                lo = middle + 1
+        return lo
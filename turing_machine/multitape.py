@@ -0,0 +1,127 @@
+"""
+Turing machines with several tapes, a head on each of them.
+"""
+from typing import Dict, Iterable, List
+from turing_machine.constants import LAMBDA, STOP_STATE, NORMAL_MODE, BY_STEP_MODE, DICT_TAPE
+from turing_machine.constants import SUCCESSFUL_STATUS, MAX_ITERATIONS_REACHED_STATUS, MAX_ITERATIONS
+from turing_machine.compiler import MOVES, MOVE_DELTAS, rules_key
+from turing_machine.tape import TAPE_ENGINES
+from turing_machine.turing_machine import Step
+
+
+class MultiTapeMachine:
+    """
+    Turing machine with `k` tapes, each with its own head.
+
+    Rules are keyed by the `k` characters read, one from every tape, written
+    as a string, and give `k` characters to write and `k` moves, also as
+    strings. For example, with two tapes ``rules["copy"]["aλ"]`` may be
+    ``["aa", "RR", "copy"]``: write ``a`` on both tapes and move both heads
+    to the right.
+
+    :param string alphabet: the alphabet of this machine
+    :param rules: maps state, characters read to [characters to write, moves, next state]
+    :type rules: {str: {str: [str]}}
+    :param tapes: what is on every tape initially, their number is `k`
+    :param positions: positions of the heads on the tapes, all at 0 by default
+    :param str initial_state: which state the machine starts from
+    :param str tape_engine: how the tapes are stored, one of :data:`~turing_machine.tape.TAPE_ENGINES` names
+    """
+    def __init__(self, *, alphabet: str, rules: Dict[str, Dict[str, list]], tapes: Iterable[str] = ('',), positions: Iterable[int] = None, initial_state: str = 'q0', tape_engine: str = DICT_TAPE):
+        self.alphabet = alphabet + LAMBDA
+        self.rules = rules
+        self.tape_engine = tape_engine
+        self.tapes = [TAPE_ENGINES[tape_engine](tape) for tape in tapes]
+        self.positions = [0] * len(self.tapes) if positions is None else list(positions)
+        if len(self.positions) != len(self.tapes):
+            raise ValueError('there must be a head position for every tape')
+        self.initial_state = initial_state
+        self.state = initial_state
+        self.tacts = 0
+        self._compiled = None
+        self._compiled_key = None
+        self.compile()
+
+    @property
+    def k(self) -> int:
+        """The number of tapes."""
+        return len(self.tapes)
+
+    def compile(self) -> Dict[str, Dict[str, tuple]]:
+        """Returns the rules as ``{state: {characters read: (characters to write, head shifts, next state, moves)}}``.
+
+        The compiled rules are cached until the alphabet or the rules change.
+
+        :raises ValueError: if a rule doesn't have a character or a move for every tape
+        """
+        key = rules_key(self.alphabet, self.rules)
+        if self._compiled is None or self._compiled_key != key:
+            compiled = {}
+            for q, line in self.rules.items():
+                compiled[q] = {}
+                for reads, (writes, moves, q_next) in line.items():
+                    if len(reads) != self.k or len(writes) != self.k or len(moves) != self.k:
+                        raise ValueError('rule of state %s for %s must have %d characters and moves' % (q, reads, self.k))
+                    if any(move not in MOVES for move in moves):
+                        raise ValueError('rule of state %s for %s has unknown move %s' % (q, reads, moves))
+                    compiled[q][reads] = writes, tuple(MOVE_DELTAS.get(move, 0) for move in moves), q_next, moves
+            self._compiled, self._compiled_key = compiled, key
+        return self._compiled
+
+    def get_tape_strings(self) -> List[str]:
+        """Returns the current state of every tape as a string"""
+        return [str(tape) for tape in self.tapes]
+
+    def run(self, mode: str = NORMAL_MODE, max_tacts: int = MAX_ITERATIONS) -> dict:
+        """Emulate the Turing machine.
+
+        :param mode: whether to include result of every step in return
+        :param max_tacts: the tacts limit
+        :returns: dictionary with the same fields as :meth:`~turing_machine.turing_machine.TuringMachine.run`
+            returns, where `result` and `head_position` describe the first tape, and:
+
+            :results: what is written on every tape
+
+            :head_positions: where the head is on every tape
+
+            In the "by step" mode, characters and moves of steps are strings of `k` characters.
+        """
+        steps = [] if mode == BY_STEP_MODE else None
+        tacts = self.__run(max_tacts, steps)
+        result = {
+            "status": SUCCESSFUL_STATUS if tacts < max_tacts else MAX_ITERATIONS_REACHED_STATUS,
+            "result": str(self.tapes[0]),
+            "iterations": tacts,
+            "head_position": self.positions[0],
+            "results": self.get_tape_strings(),
+            "head_positions": list(self.positions)
+        }
+        if mode == BY_STEP_MODE:
+            result["steps"] = steps
+        return result
+
+    def __run(self, max_tacts: int, steps: list) -> int:
+        """Runs the machine, returns number of tacts done.
+
+        :param steps: list to append information about every step to, ``None`` not to collect it
+        """
+        table = self.compile()
+        tapes, positions = self.tapes, self.positions
+        heads = range(self.k)
+        state = self.state
+        tacts = 0
+        try:
+            while state != STOP_STATE and tacts < max_tacts:
+                reads = ''.join([tapes[i][positions[i]] for i in heads])
+                writes, deltas, q_next, moves = table[state][reads]
+                for i in heads:
+                    tapes[i][positions[i]] = writes[i]
+                    positions[i] += deltas[i]
+                if steps is not None:
+                    steps.append(Step(state, q_next, reads, writes, moves, tacts)._asdict())
+                state = q_next
+                tacts += 1
+        finally:
+            self.state = state
+            self.tacts += tacts
+        return tacts
@@ -0,0 +1,270 @@
+"""
+Nondeterministic Turing machines, explored breadth-first over configurations.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from turing_machine.constants import LAMBDA, STOP_STATE, PERSISTENT_TAPE, MAX_ITERATIONS
+from turing_machine.constants import ACCEPTED_STATUS, REJECTED_STATUS, MAX_ITERATIONS_REACHED_STATUS, FRONTIER_LIMIT_STATUS
+from turing_machine.constants import FRONTIER_LIMIT, PARALLEL_FRONTIER
+from turing_machine.compiler import MOVE_DELTAS
+from turing_machine.tape import TAPE_ENGINES, zobrist
+
+
+def transitions(rules: Dict[str, Dict[str, list]]) -> Dict[str, Dict[str, tuple]]:
+    """Returns the rules as ``{state: {character: ((symbol, head shift, next state), ...)}}``.
+
+    A rule is either one [symbol, move, next state] triple, as for a
+    deterministic machine, or a list of such triples, an empty list meaning
+    no transitions.
+    """
+    return {
+        q: {
+            c: tuple(
+                (c_next, MOVE_DELTAS.get(move, 0), q_next)
+                for c_next, move, q_next in ([rule] if rule and isinstance(rule[0], str) else rule)
+            )
+            for c, rule in line.items()
+        }
+        for q, line in rules.items()
+    }
+
+
+class Branch:
+    """A configuration of the machine in the search tree.
+
+    Branches share tapes until one of them writes a different character:
+    `shared` is a list ``[tape, number of branches using it]``, and the tape
+    is copied on write only if anyone else uses it.
+
+    :param path: pair of the transition number and the path of the parent branch, ``None`` for the root
+    """
+    __slots__ = ('state', 'position', 'shared', 'path')
+
+    def __init__(self, state: str, position: int, shared: list, path: tuple = None):
+        self.state = state
+        self.position = position
+        self.shared = shared
+        self.path = path
+
+    @property
+    def tape(self):
+        """The tape of the branch, which must not be changed."""
+        return self.shared[0]
+
+    def choices(self) -> List[int]:
+        """Returns numbers of transitions taken from the root to this branch."""
+        choices = []
+        path = self.path
+        while path is not None:
+            choices.append(path[0])
+            path = path[1]
+        return choices[::-1]
+
+
+class NondeterministicMachine:
+    """
+    Nondeterministic Turing machine: a rule may list several transitions.
+
+    A run explores all the branches of computation breadth-first and accepts
+    as soon as one of them comes to :data:`STOP_STATE`. A branch with no rule
+    for its configuration dies, a configuration seen before is not explored
+    again.
+
+    :param string alphabet: the alphabet of this machine
+    :param rules: maps state, character to [symbol, move, next state] or to list of them
+    :type rules: {str: {str: [str] or [[str]]}}
+    :param str tape: what is on the tape initially
+    :param int position: position of the machine's head on the tape
+    :param str initial_state: which state the machine starts from
+    :param str tape_engine: how the tapes are stored, one of :data:`~turing_machine.tape.TAPE_ENGINES` names
+    """
+    def __init__(self, *, alphabet: str, rules: Dict[str, Dict[str, list]], tape: str = '', position: int = 0, initial_state: str = 'q0', tape_engine: str = PERSISTENT_TAPE):
+        self.alphabet = alphabet + LAMBDA
+        self.rules = rules
+        self.tape_engine = tape_engine
+        self.tape = TAPE_ENGINES[tape_engine](tape)
+        self.position = position
+        self.initial_state = initial_state
+
+    def run(self, max_depth: int = MAX_ITERATIONS, max_frontier: int = FRONTIER_LIMIT, max_seen: int = None, workers: int = None, parallel_frontier: int = PARALLEL_FRONTIER) -> dict:
+        """Explore the machine breadth-first.
+
+        :param max_depth: the tacts limit of every branch
+        :param max_frontier: how many configurations of one depth may be kept at most
+        :param max_seen: how many fingerprints of explored configurations to keep for deduplication,
+            ten times `max_frontier` by default; fingerprints of the oldest depths are forgotten first
+        :param workers: number of processes to expand large frontiers in, no processes by default
+        :param parallel_frontier: how many configurations there must be at a depth to expand them in processes
+        :returns: dictionary with fields:
+
+            :status: whether a branch was accepted, all of them died (rejected), or the depth or frontier limit was reached
+
+            :result: what is written on the tape of the accepted branch, or of the initial configuration otherwise
+
+            :iterations: the depth the exploration reached
+
+            :head_position: where the head of the accepted branch is on the tape, or the initial position otherwise
+
+            :branch: numbers of transitions taken by the accepted branch at every tact, included only if accepted
+
+            :depth: how many tacts the accepted branch did, included only if accepted
+
+            :configurations: how many configurations were explored
+        """
+        if max_seen is None:
+            max_seen = 10 * max_frontier
+        rules = transitions(self.rules)
+        root = Branch(self.initial_state, self.position, [self.tape.fork(), 1])
+        frontier = [root]
+        fingerprint = (root.state, root.position, root.tape.fingerprint())
+        seen = {fingerprint: 0}
+        levels = deque([[fingerprint]])
+        explored = 1
+
+        executor = None
+        if workers is not None and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules, self.tape_engine))
+
+        try:
+            depth = 0
+            status = None
+            accepted = root if root.state == STOP_STATE else None
+            while accepted is None and frontier and depth < max_depth:
+                level = []
+
+                def fresh(fingerprint):
+                    if fingerprint in seen:
+                        return False
+                    seen[fingerprint] = depth + 1
+                    level.append(fingerprint)
+                    return True
+
+                if executor is not None and len(frontier) >= parallel_frontier:
+                    children = self.__expand_in_processes(executor, frontier, workers, fresh)
+                else:
+                    children = (child for branch in frontier for child in self.__expand(branch, rules, fresh))
+
+                frontier = []
+                for child in children:
+                    explored += 1
+                    if child.state == STOP_STATE:
+                        accepted = child
+                        break
+                    frontier.append(child)
+                    if len(frontier) > max_frontier:
+                        status = FRONTIER_LIMIT_STATUS
+                        break
+                depth += 1
+
+                levels.append(level)
+                while len(levels) > 1 and len(seen) > max_seen:
+                    for fingerprint in levels.popleft():
+                        del seen[fingerprint]
+                if status is not None:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if accepted is not None:
+            return {
+                "status": ACCEPTED_STATUS,
+                "result": str(accepted.tape),
+                "iterations": depth,
+                "head_position": accepted.position,
+                "branch": accepted.choices(),
+                "depth": depth,
+                "configurations": explored
+            }
+        if status is None:
+            status = MAX_ITERATIONS_REACHED_STATUS if frontier else REJECTED_STATUS
+        return {
+            "status": status,
+            "result": str(self.tape),
+            "iterations": depth,
+            "head_position": self.position,
+            "configurations": explored
+        }
+
+    @staticmethod
+    def __expand(branch: Branch, rules: dict, fresh):
+        """Yields children of the branch whose configurations are fresh.
+
+        Children which don't change the tape share it with the parent. Of the
+        others, the last one takes the tape over if nobody else uses it, the
+        rest get forks. Fingerprints are checked before forking, so
+        duplicates cost nothing.
+        """
+        shared = branch.shared
+        tape, position = shared[0], branch.position
+        c = tape[position]
+        fingerprint = tape.fingerprint()
+        shared[1] -= 1
+
+        children = []
+        writers = 0
+        for choice, (c_next, delta, q_next) in enumerate(rules.get(branch.state, {}).get(c, ())):
+            if c_next == c:
+                if fresh((q_next, position + delta, fingerprint)):
+                    shared[1] += 1
+                    children.append((choice, c_next, delta, q_next))
+            elif fresh((q_next, position + delta, fingerprint ^ zobrist(position, c) ^ zobrist(position, c_next))):
+                writers += 1
+                children.append((choice, c_next, delta, q_next))
+
+        for choice, c_next, delta, q_next in children:
+            child_shared = shared
+            if c_next != c:
+                writers -= 1
+                if writers == 0 and shared[1] == 0:
+                    shared[1] = 1
+                else:
+                    child_shared = [tape.fork(), 1]
+                child_shared[0][position] = c_next
+            yield Branch(q_next, position + delta, child_shared, (choice, branch.path))
+
+    def __expand_in_processes(self, executor: ProcessPoolExecutor, frontier: List[Branch], workers: int, fresh):
+        """Yields children of the frontier branches whose configurations are fresh, expanding the branches in worker processes."""
+        configurations = []
+        for branch in frontier:
+            offset, _ = branch.tape.bounds
+            configurations.append((branch.state, branch.position, offset, str(branch.tape)))
+            branch.shared[1] -= 1
+
+        chunksize = max(1, len(configurations) // (4 * workers))
+        for branch, children in zip(frontier, executor.map(_expand_configuration, configurations, chunksize=chunksize)):
+            for choice, q_next, position, offset, tape, fingerprint in children:
+                if fresh((q_next, position, fingerprint)):
+                    yield Branch(q_next, position, [TAPE_ENGINES[self.tape_engine](tape, offset), 1], (choice, branch.path))
+
+
+_worker_rules = None
+"""Transitions of the machine of an exploration worker process, see :func:`transitions`."""
+_worker_tape_engine = None
+"""Tape engine of the machine of an exploration worker process."""
+
+
+def _init_worker(rules: dict, tape_engine: str):
+    """Sets up the machine of an exploration worker process."""
+    global _worker_rules, _worker_tape_engine
+    _worker_rules, _worker_tape_engine = rules, tape_engine
+
+
+def _expand_configuration(configuration: tuple) -> list:
+    """Returns children of the configuration (state, position, tape offset, tape) as tuples
+    (transition number, state, position, tape offset, tape, fingerprint of the tape)."""
+    state, position, offset, tape = configuration
+    c = tape[position - offset] if 0 <= position - offset < len(tape) else LAMBDA
+    fingerprint = TAPE_ENGINES[_worker_tape_engine](tape, offset).fingerprint()
+
+    children = []
+    for choice, (c_next, delta, q_next) in enumerate(_worker_rules.get(state, {}).get(c, ())):
+        child = TAPE_ENGINES[_worker_tape_engine](tape, offset)
+        child[position] = c_next
+        child_offset, _ = child.bounds
+        children.append((
+            choice, q_next, position + delta, child_offset, str(child),
+            fingerprint ^ zobrist(position, c) ^ zobrist(position, c_next)
+        ))
+    return children
@@ -0,0 +1,71 @@
+"""
+Statistics of Turing machine runs: which rules are hot and how the head travels.
+"""
+import time
+
+
+class Profiler:
+    """Collects statistics of a machine run step by step.
+
+    :param machine: the machine to watch, in its configuration at the start of the run
+    """
+    def __init__(self, machine):
+        self.machine = machine
+        self.hits = {}
+        self.travel = 0
+        self.position = machine.position
+
+        left, right = machine.tape.bounds
+        self.leftmost = min(left, self.position) if left < right else self.position
+        self.rightmost = max(right - 1, self.position) if left < right else self.position
+
+        self.times = {}
+        self.__phase = None
+        self.__started = None
+
+    def phase(self, name: str):
+        """Finishes timing of the current phase of the run and starts timing of the next one."""
+        now = time.perf_counter()
+        if self.__phase is not None:
+            self.times[self.__phase] = self.times.get(self.__phase, 0) + now - self.__started
+        self.__phase = name
+        self.__started = now
+
+    def step(self, step) -> bool:
+        """Registers a tact of the machine, never asks to stop it."""
+        line = self.hits.setdefault(step.curr_state, {})
+        line[step.curr_character] = line.get(step.curr_character, 0) + 1
+
+        position = self.machine.position
+        if position != self.position:
+            self.travel += abs(position - self.position)
+            self.position = position
+            if position < self.leftmost:
+                self.leftmost = position
+            elif position > self.rightmost:
+                self.rightmost = position
+        return False
+
+    def as_dict(self) -> dict:
+        """Returns the statistics as dictionary with fields:
+
+            :rules: maps state, character to how many times the rule was applied
+
+            :head_travel: how many cells the head has moved by in total
+
+            :head_range: the leftmost and the rightmost cells the head has visited
+
+            :tape_extent: how many cells there are from the leftmost to the rightmost one either written initially or visited
+
+            :time: maps phase of the run (``compile``, ``run``, ``result``) to its wall time in seconds
+        """
+        left, right = self.machine.tape.bounds
+        leftmost = min(self.leftmost, left) if left < right else self.leftmost
+        rightmost = max(self.rightmost, right - 1) if left < right else self.rightmost
+        return {
+            "rules": self.hits,
+            "head_travel": self.travel,
+            "head_range": [self.leftmost, self.rightmost],
+            "tape_extent": rightmost - leftmost + 1,
+            "time": dict(self.times)
+        }
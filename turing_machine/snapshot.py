@@ -0,0 +1,36 @@
+"""
+Snapshots of Turing machine configurations, used to pause and resume long runs.
+"""
+import json
+import os
+from typing import NamedTuple
+
+
+class Snapshot(NamedTuple):
+    """Everything needed to continue a machine run, except for the rules.
+
+    Only the written region of the tape is stored, so the size of a snapshot
+    is proportional to it and doesn't depend on the run history.
+    """
+    state: str
+    position: int
+    offset: int
+    tape: str
+    tacts: int
+
+    def save(self, path: str):
+        """Writes the snapshot to the file.
+
+        The file is replaced atomically, so it always holds a complete snapshot,
+        even if the process is killed while saving.
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self._asdict(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Snapshot':
+        """Reads a snapshot written by :meth:`save`."""
+        with open(path, encoding='utf-8') as f:
+            return cls(**json.load(f))
@@ -1,43 +1,191 @@
-from collections import defaultdict
-from turing_machine.constants import LAMBDA
+import mmap
+import os
+from array import array
+from itertools import repeat
+from turing_machine.constants import LAMBDA, DICT_TAPE, ARRAY_TAPE, PERSISTENT_TAPE
+
+MASK = (1 << 64) - 1
+PAGE_BITS = 6
+"""Binary logarithm of the number of cells in a page of :class:`PersistentTape`."""
+PAGE_SIZE = 1 << PAGE_BITS
+"""Number of cells in a page of :class:`PersistentTape`."""
+PAGE_MASK = PAGE_SIZE - 1
+"""Mask of the index of a cell in its page of :class:`PersistentTape`."""
+BRANCH_BITS = 5
+"""Binary logarithm of the number of branches of a node of :class:`PersistentTape`."""
+BRANCH_SIZE = 1 << BRANCH_BITS
+"""Number of branches of a node of :class:`PersistentTape`."""
+BRANCH_MASK = BRANCH_SIZE - 1
+"""Mask of the index of a branch in its node of :class:`PersistentTape`."""
+SCAN_SIZE = 1 << 16
+"""How many cells are scanned at once at most looking for the bounds of the written region."""
+
+
+def _text(input) -> str:
+    """Returns tape input as a string, decoding bytes-like objects from UTF-8."""
+    if isinstance(input, str):
+        return input
+    return str(input, 'utf-8')
+
+
+def zobrist(index: int, char: str) -> int:
+    """Returns pseudo-random 64-bit number of the character in the cell (0 for an empty cell).
+
+    The numbers don't depend on the process, so fingerprints are comparable between processes.
+    """
+    if char == LAMBDA:
+        return 0
+    x = ((index & MASK) * 0x9E3779B97F4A7C15 + ord(char)) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
 
 
 class Tape:
     """Infinite tape of characters.
 
     Characters are indexed with integers (use tape[i] to access a character).
+    Only non-empty cells are stored. The bounds of the written region (from
+    the leftmost to the rightmost non-empty cell) are extended on writes, and
+    erasing a cell at a bound only marks them stale: they are rescanned once
+    they are asked for, so reads and writes take O(1) time.
 
-    :param str: string written on the tape initially (starting from index 0)
+    :param input: string written on the tape initially, or a bytes-like object with it in UTF-8
+    :param int offset: index of the first character of the string
     """
-    def __init__(self, input: str = ''):
-        self._chars = defaultdict(lambda: LAMBDA)
-        self._chars.update(enumerate(input))
-        self._left = 0
-        self._right = len(input)
+    def __init__(self, input='', offset: int = 0):
+        input = _text(input)
+        self._chars = dict(zip(range(offset, offset + len(input)), input))
+        if LAMBDA in input:
+            self._chars = {i: c for i, c in self._chars.items() if c != LAMBDA}
+        self._left, self._right = self._input_bounds(input, offset)
+        self._stale = False
+        self._hash = None
+
+    def fingerprint(self) -> int:
+        """Returns 64-bit Zobrist hash of the tape content: XOR of :func:`zobrist` of all the cells.
+
+        It's computed in O(n) on the first call and then kept up to date in
+        O(1) on every write, so equal tapes have equal fingerprints and
+        different tapes almost certainly don't.
+        """
+        if self._hash is None:
+            self._hash = 0
+            left, right = self.bounds
+            for i in range(left, right):
+                self._hash ^= zobrist(i, self[i])
+        return self._hash
+
+    def fork(self):
+        """Returns an independent copy of the tape."""
+        tape = object.__new__(type(self))
+        tape.__dict__.update(self.__dict__)
+        tape._chars = dict(self._chars)
+        return tape
+
+    @staticmethod
+    def _input_bounds(input: str, offset: int):
+        """Returns bounds of the string written from cell `offset`, blanks at its ends included, (0, 0) if it is empty."""
+        return (offset, offset + len(input)) if input else (0, 0)
 
     def filter(self, alphabet: str):
         """Filter tape. Remove characters from the tape if they are not in the alphabet."""
         indices_to_remove = [i for i, c in self._chars.items() if c not in alphabet]
         for i in indices_to_remove:
             self._chars.pop(i)
+        self._hash = None
+
+        if self._chars:
+            self._right = max(self._chars.keys()) + 1
+            self._left = min(self._chars.keys())
+        else:
+            self._left = self._right = 0
+        self._stale = False
+
+    @property
+    def bounds(self):
+        """Pair of indices: of the leftmost written cell and of the cell next to the rightmost one."""
+        if self._stale:
+            self._left, self._right = self._scan_bounds()
+            self._stale = False
+        return self._left, self._right
+
+    def _extend_bounds(self, key: int):
+        """Extends the bounds of the written region to the cell `key` just written with a character."""
+        if self._left == self._right:
+            self._left, self._right = key, key + 1
+        elif key < self._left:
+            self._left = key
+        elif key >= self._right:
+            self._right = key + 1
+
+    def _erased(self, key: int):
+        """Marks the bounds of the written region stale if the cell `key` just erased was at one of them."""
+        if key == self._left or key == self._right - 1:
+            self._stale = True
+
+    def _scan_bounds(self):
+        """Returns bounds of the written region, looking for them inside the stale ones.
+
+        Cells are scanned from both ends in slices growing twice up to
+        :data:`SCAN_SIZE`, so it takes time proportional to the empty cells
+        skipped.
+        """
+        left, right = self._left, self._right
+        size = PAGE_SIZE
+        while left < right:
+            end = min(right, left + size)
+            rest = len(self.slice(left, end).lstrip(LAMBDA))
+            if rest:
+                left = end - rest
+                break
+            left, size = end, min(2 * size, SCAN_SIZE)
 
-        self._right = max(self._chars.keys()) + 1
-        self._left = min(self._chars.keys())
+        size = PAGE_SIZE
+        while right > left:
+            start = max(left, right - size)
+            rest = len(self.slice(start, right).rstrip(LAMBDA))
+            if rest:
+                right = start + rest
+                break
+            right, size = start, min(2 * size, SCAN_SIZE)
+        return (left, right) if left < right else (0, 0)
 
     def __getitem__(self, key):
-        return self._chars[key]
+        return self._chars.get(key, LAMBDA)
 
     def __setitem__(self, key, value):
+        if self._hash is not None:
+            self._hash ^= zobrist(key, self[key]) ^ zobrist(key, value)
+
         if value != LAMBDA:
             self._chars[key] = value
-        elif key in self._chars:
-            self._chars.pop(key)
+            self._extend_bounds(key)
+        elif self._chars.pop(key, None) is not None:
+            self._erased(key)
+
+    def slice(self, lo: int, hi: int) -> str:
+        """Returns characters of the cells from `lo` to `hi` (excluded) as a string."""
+        if hi <= lo:
+            return ''
+        chars = self._chars
+        if self._left <= lo and hi <= self._right and len(chars) == self._right - self._left:
+            return ''.join(map(chars.__getitem__, range(lo, hi)))
+        if hi - lo > 2 * len(chars):
+            cells = [LAMBDA] * (hi - lo)
+            for i, c in chars.items():
+                if lo <= i < hi:
+                    cells[i - lo] = c
+            return ''.join(cells)
+        return ''.join(map(chars.get, range(lo, hi), repeat(LAMBDA)))
 
-        self._right = max(self._chars.keys()) + 1
-        self._left = min(self._chars.keys())
+    def tobytes(self, lo: int = None, hi: int = None) -> bytes:
+        """Returns characters of the cells from `lo` to `hi` (excluded) encoded in UTF-8, the written region by default."""
+        left, right = self.bounds
+        return self.slice(left if lo is None else lo, right if hi is None else hi).encode()
 
     def __str__(self):
-        return ''.join(self._chars[i] for i in range(self._left, self._right))
+        return self.slice(*self.bounds)
 
     def string_with_position(self, head: int):
         """String representation with head position marked in []
@@ -45,12 +193,324 @@ class Tape:
         :param head: index where to mark head
         :type head: int
         """
-        if head < self._left:
-            return f'[{LAMBDA}]' + LAMBDA * (self._left - head - 1) + str(self)
-        if head >= self._right:
-            return str(self) + LAMBDA * (head - self._right) + f'[{LAMBDA}]'
-
-        left = ''.join(self._chars[i] for i in range(self._left, head))
-        curr = f'[{self._chars[head]}]'
-        right = ''.join(self._chars[i] for i in range(head + 1, self._right))
-        return left + curr + right
+        left, right = self.bounds
+        lo = min(head, left)
+        string = self.slice(lo, max(head + 1, right))
+        head -= lo
+        return string[:head] + f'[{string[head]}]' + string[head + 1:]
+
+
+class ArrayTape(Tape):
+    """Infinite tape of characters kept in a contiguous buffer.
+
+    Every cell holds a small integer code of its character (0 stands for
+    :data:`LAMBDA`), so a cell takes one byte while the tape uses no more than
+    255 distinct characters and four bytes after that. The buffer grows
+    geometrically to both sides as the written region expands.
+
+    Input is converted to codes and back by :meth:`str.translate` and
+    :meth:`bytes.translate`, without a Python loop over the cells. A tape can
+    also be mapped from a file by :meth:`load`.
+
+    :param input: string written on the tape initially, or a bytes-like object with it in UTF-8
+    :param int offset: index of the first character of the string
+    """
+    def __init__(self, input='', offset: int = 0):
+        self._symbols = [LAMBDA]
+        self._codes = {LAMBDA: 0}
+        self._decoding = None
+        self._cells = bytearray()
+        self._origin = -offset
+        self._stale = False
+        self._hash = None
+
+        if not isinstance(input, str):
+            data = bytes(input)
+            if data.isascii():
+                self.__load_ascii(data, offset)
+                return
+            input = _text(data)
+
+        for c in sorted(set(input)):
+            self.__code(c)
+        if len(self._symbols) <= 256:
+            encoding = {ord(c): chr(code) for c, code in self._codes.items()}
+            self._cells = bytearray(input.translate(encoding).encode('latin-1'))
+        else:
+            self._cells = array('I', map(self._codes.__getitem__, input))
+        self._left, self._right = self._input_bounds(input, offset)
+
+    def __load_ascii(self, data: bytes, offset: int):
+        """Writes ASCII characters of `data` on the empty tape from cell `offset`."""
+        characters = bytes(sorted(set(data)))
+        codes = bytes(self.__code(chr(c)) for c in characters)
+        self._cells = bytearray(data.translate(bytes.maketrans(characters, codes)))
+        self._left, self._right = (offset, offset + len(data)) if data else (0, 0)
+
+    @classmethod
+    def load(cls, path: str, offset: int = 0) -> 'ArrayTape':
+        """Returns the tape stored in the file, one cell per byte: the character with the byte's code, or :data:`LAMBDA` for a zero byte.
+
+        The file is mapped into memory copy-on-write, so it isn't read
+        until the cells are accessed, and writes to the tape never reach it.
+        Writing beyond the file end or character codes over 255 copy the
+        tape into memory.
+
+        :param path: the file to map
+        :param offset: index of the cell of the first byte
+        """
+        tape = cls(offset=offset)
+        if os.path.getsize(path) == 0:
+            return tape
+        for code in range(1, 256):
+            tape.__code(chr(code))
+        with open(path, 'rb') as f:
+            cells = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        tape._cells = cells
+        tape._left, tape._right = offset, offset + len(cells)
+        tape._stale = True
+        return tape
+
+    def fork(self):
+        """Returns an independent copy of the tape."""
+        tape = object.__new__(type(self))
+        tape.__dict__.update(self.__dict__)
+        tape._symbols = list(self._symbols)
+        tape._codes = dict(self._codes)
+        tape._cells = bytearray(self._cells) if isinstance(self._cells, mmap.mmap) else self._cells[:]
+        return tape
+
+    def __code(self, char: str) -> int:
+        """Returns code of the character, registering it if it is met first time."""
+        code = self._codes.get(char)
+        if code is None:
+            code = len(self._symbols)
+            if code == 256 and not isinstance(self._cells, array):
+                self._cells = array('I', list(self._cells))
+            self._symbols.append(char)
+            self._codes[char] = code
+        return code
+
+    def __blanks(self, count: int):
+        """Returns a buffer of `count` empty cells of the same type as the tape buffer."""
+        if isinstance(self._cells, array):
+            return array('I', [0]) * count
+        return bytearray(count)
+
+    def __reserve(self, key: int) -> int:
+        """Grows the buffer so that it contains cell `key`, returns its index in the buffer."""
+        index = key + self._origin
+        size = len(self._cells)
+        if index < 0:
+            extra = max(-index, size, 16)
+            self._cells = self.__blanks(extra) + self._cells
+            self._origin += extra
+            index += extra
+        elif index >= size:
+            if isinstance(self._cells, mmap.mmap):
+                self._cells = bytearray(self._cells)
+            self._cells.extend(self.__blanks(max(index - size + 1, size, 16)))
+        return index
+
+    def filter(self, alphabet: str):
+        """Filter tape. Remove characters from the tape if they are not in the alphabet."""
+        removed = {code for code, c in enumerate(self._symbols) if code and c not in alphabet}
+        if removed:
+            cells = self._cells
+            for i, code in enumerate(cells):
+                if code in removed:
+                    cells[i] = 0
+            self._hash = None
+
+        written = [i for i, code in enumerate(self._cells) if code]
+        if written:
+            self._left = written[0] - self._origin
+            self._right = written[-1] + 1 - self._origin
+        else:
+            self._left = self._right = 0
+        self._stale = False
+
+    def __getitem__(self, key):
+        index = key + self._origin
+        if 0 <= index < len(self._cells):
+            return self._symbols[self._cells[index]]
+        return LAMBDA
+
+    def __setitem__(self, key, value):
+        if self._hash is not None:
+            self._hash ^= zobrist(key, self[key]) ^ zobrist(key, value)
+
+        code = self.__code(value)
+        if code:
+            index = self.__reserve(key)
+            self._cells[index] = code
+            self._extend_bounds(key)
+            return
+
+        index = key + self._origin
+        if not 0 <= index < len(self._cells) or not self._cells[index]:
+            return
+
+        self._cells[index] = 0
+        self._erased(key)
+
+    def slice(self, lo: int, hi: int) -> str:
+        """Returns characters of the cells from `lo` to `hi` (excluded) as a string."""
+        if hi <= lo:
+            return ''
+        origin = self._origin
+        start, end = max(lo + origin, 0), min(hi + origin, len(self._cells))
+        if start >= end:
+            return LAMBDA * (hi - lo)
+
+        cells = self._cells[start:end]
+        if isinstance(cells, array):
+            string = ''.join(map(self._symbols.__getitem__, cells))
+        else:
+            if self._decoding is None or len(self._decoding) != len(self._symbols):
+                self._decoding = {code: c for code, c in enumerate(self._symbols) if chr(code) != c}
+            string = bytes(cells).decode('latin-1').translate(self._decoding)
+        return LAMBDA * (start - origin - lo) + string + LAMBDA * (hi + origin - end)
+
+
+class PersistentTape(Tape):
+    """Infinite tape of characters kept in pages shared between forks.
+
+    The tape is split into pages of :data:`PAGE_SIZE` cells, kept in two
+    radix trees of :data:`BRANCH_SIZE` branches per node: one for the cells
+    to the right of zero and one for the cells to the left of it. Only pages
+    with written cells are stored.
+
+    :meth:`fork` takes O(1) time: the fork and the original share all the
+    nodes. A write copies only the page it touches and the path to it, the
+    first time the tape writes there after forking, so tapes differing in a
+    few cells take about as much memory as one tape.
+
+    Every node and page ends with the token of the tape that may change it in
+    place, which is replaced by a new one on fork.
+
+    :param input: string written on the tape initially, or a bytes-like object with it in UTF-8
+    :param int offset: index of the first character of the string
+    """
+    def __init__(self, input='', offset: int = 0):
+        input = _text(input)
+        self._token = object()
+        self._roots = [None, None]
+        self._depths = [0, 0]
+        self._cached = None
+        self._cached_page = None
+        for index in range(offset >> PAGE_BITS, (offset + len(input) + PAGE_SIZE - 1) >> PAGE_BITS):
+            start = max(index << PAGE_BITS, offset)
+            chunk = input[start - offset:((index + 1) << PAGE_BITS) - offset]
+            if chunk.strip(LAMBDA):
+                start &= PAGE_MASK
+                self.__writable_page(index)[start:start + len(chunk)] = chunk
+        self._left, self._right = self._input_bounds(input, offset)
+        self._stale = False
+        self._hash = None
+
+    def fork(self):
+        """Returns a copy of the tape sharing all the pages with this one."""
+        tape = object.__new__(type(self))
+        tape.__dict__.update(self.__dict__)
+        tape._token = object()
+        tape._roots = list(self._roots)
+        tape._depths = list(self._depths)
+        self._token = object()
+        return tape
+
+    def __page(self, index: int) -> list:
+        """Returns page `index`, None if it has never been written."""
+        if index == self._cached:
+            return self._cached_page
+        side = 0
+        if index < 0:
+            index, side = ~index, 1
+        node, depth = self._roots[side], self._depths[side]
+        if node is None or index >> (BRANCH_BITS * depth):
+            return None
+        for level in range(BRANCH_BITS * (depth - 1), -1, -BRANCH_BITS):
+            node = node[(index >> level) & BRANCH_MASK]
+            if node is None:
+                return None
+        self._cached, self._cached_page = (~index if side else index), node
+        return node
+
+    def __writable_page(self, index: int) -> list:
+        """Returns page `index` for writing, copying it and the path to it if they are shared with other tapes."""
+        page = self.__page(index)
+        token = self._token
+        if page is not None and page[-1] is token:
+            return page
+
+        side, key = 0, index
+        if key < 0:
+            key, side = ~key, 1
+        root, depth = self._roots[side], self._depths[side]
+        if root is None:
+            root, depth = [None] * BRANCH_SIZE + [token], 1
+        elif root[-1] is not token:
+            root = root[:-1] + [token]
+        while key >> (BRANCH_BITS * depth):
+            root, depth = [root] + [None] * (BRANCH_SIZE - 1) + [token], depth + 1
+        self._roots[side], self._depths[side] = root, depth
+
+        node = root
+        for level in range(BRANCH_BITS * (depth - 1), 0, -BRANCH_BITS):
+            i = (key >> level) & BRANCH_MASK
+            child = node[i]
+            if child is None:
+                child = node[i] = [None] * BRANCH_SIZE + [token]
+            elif child[-1] is not token:
+                child = node[i] = child[:-1] + [token]
+            node = child
+
+        i = key & BRANCH_MASK
+        page = node[i]
+        page = node[i] = [LAMBDA] * PAGE_SIZE + [token] if page is None else page[:-1] + [token]
+        self._cached, self._cached_page = index, page
+        return page
+
+    def filter(self, alphabet: str):
+        """Filter tape. Remove characters from the tape if they are not in the alphabet."""
+        left, _ = self.bounds
+        self.__init__(''.join(c if c in alphabet else LAMBDA for c in str(self)), left)
+        self._stale = True
+
+    def __getitem__(self, key):
+        page = self.__page(key >> PAGE_BITS)
+        if page is None:
+            return LAMBDA
+        return page[key & PAGE_MASK]
+
+    def __setitem__(self, key, value):
+        old = self[key]
+        if old == value:
+            return
+        if self._hash is not None:
+            self._hash ^= zobrist(key, old) ^ zobrist(key, value)
+        self.__writable_page(key >> PAGE_BITS)[key & PAGE_MASK] = value
+
+        if value != LAMBDA:
+            self._extend_bounds(key)
+        else:
+            self._erased(key)
+
+    def slice(self, lo: int, hi: int) -> str:
+        """Returns characters of the cells from `lo` to `hi` (excluded) as a string."""
+        if hi <= lo:
+            return ''
+        first, last = lo >> PAGE_BITS, (hi - 1) >> PAGE_BITS
+        blank = LAMBDA * PAGE_SIZE
+        pages = (self.__page(i) for i in range(first, last + 1))
+        string = ''.join(blank if page is None else ''.join(page[:PAGE_SIZE]) for page in pages)
+        start = lo - (first << PAGE_BITS)
+        return string[start:start + hi - lo]
+
+
+TAPE_ENGINES = {
+    DICT_TAPE: Tape,
+    ARRAY_TAPE: ArrayTape,
+    PERSISTENT_TAPE: PersistentTape,
+}
+"""Maps tape engine name to the class implementing it."""
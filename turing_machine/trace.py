@@ -0,0 +1,209 @@
+"""
+Compact binary traces of Turing machine runs.
+
+A trace file starts with a header naming the states, characters and moves of
+the machine, followed by one fixed-width record per tact, so any tact can be
+read without decoding the ones before it.
+
+Command line usage::
+
+    python -m turing_machine.trace record machine.json run.trace --max-tacts 100000
+    python -m turing_machine.trace show run.trace --start 500 --count 20
+    python -m turing_machine.trace replay machine.json run.trace --tact 500
+"""
+import argparse
+import json
+import mmap
+import struct
+
+from turing_machine.constants import MAX_ITERATIONS, MOVE_LEFT, MOVE_RIGHT, DICT_TAPE, ARRAY_TAPE
+from turing_machine.turing_machine import TuringMachine, Step
+from turing_machine.tape import TAPE_ENGINES, ArrayTape
+
+MAGIC = b'TMTRACE\0'
+"""Marks the beginning of a trace file."""
+VERSION = 1
+"""Version of the trace format."""
+HEADER = struct.Struct('<8sHI')
+"""Magic, version and length of the names table in JSON."""
+RECORD = struct.Struct('<IHIHB')
+"""Current state, current character, next state, next character and move codes of a tact."""
+
+
+class TraceWriter:
+    """Writes steps of a machine run to a trace file.
+
+    Pass it as `trace` to :meth:`~turing_machine.turing_machine.TuringMachine.run`.
+
+    :param path: where to write the trace
+    :param machine: the machine to be traced, its rules define names in the trace
+    """
+    def __init__(self, path: str, machine: TuringMachine):
+        compiled = machine.compile()
+        moves = sorted({move for line in machine.rules.values() for _, move, _ in line.values()})
+        self.state_codes = compiled.state_codes
+        self.symbol_codes = compiled.symbol_codes
+        self.move_codes = {move: code for code, move in enumerate(moves)}
+
+        names = json.dumps({
+            "states": compiled.states,
+            "symbols": compiled.symbols,
+            "moves": moves
+        }, ensure_ascii=False).encode('utf-8')
+
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(names)))
+        self.file.write(names)
+
+    def write(self, step: Step):
+        """Appends the step to the trace."""
+        self.file.write(RECORD.pack(
+            self.state_codes[step.curr_state],
+            self.symbol_codes[step.curr_character],
+            self.state_codes[step.next_state],
+            self.symbol_codes[step.next_character],
+            self.move_codes[step.move]
+        ))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TraceReader:
+    """Reads a trace file with random access to tacts.
+
+    The file is memory-mapped, ``reader[n]`` decodes only the record of tact
+    `n`, slices return lists of steps.
+
+    :param path: the trace file
+    """
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, names_size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a trace file of version {VERSION}')
+
+        names = json.loads(self.data[HEADER.size:HEADER.size + names_size].decode('utf-8'))
+        self.states = names["states"]
+        self.symbols = names["symbols"]
+        self.moves = names["moves"]
+        self.offset = HEADER.size + names_size
+
+    def __len__(self):
+        return (len(self.data) - self.offset) // RECORD.size
+
+    def __getitem__(self, tact):
+        if isinstance(tact, slice):
+            return [self[i] for i in range(*tact.indices(len(self)))]
+
+        if tact < 0:
+            tact += len(self)
+        if not 0 <= tact < len(self):
+            raise IndexError('tact out of trace')
+
+        q, c, q_next, c_next, move = RECORD.unpack_from(self.data, self.offset + tact * RECORD.size)
+        return Step(
+            self.states[q], self.states[q_next],
+            self.symbols[c], self.symbols[c_next],
+            self.moves[move], tact
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def replay(machine: TuringMachine, trace: TraceReader, tacts: int):
+    """Applies the first `tacts` steps of the trace to the machine tape without using its rules."""
+    for step in trace[:tacts]:
+        machine.tape[machine.position] = step.next_character
+        if step.move == MOVE_RIGHT:
+            machine.position += 1
+        elif step.move == MOVE_LEFT:
+            machine.position -= 1
+        machine.state = step.next_state
+
+
+def load_machine(path: str, tape_file: str = None, **kwargs) -> TuringMachine:
+    """Creates a machine from a JSON file with its config.
+
+    :param tape_file: file to map the initial tape from instead of the config one, see :meth:`ArrayTape.load`
+    :param kwargs: arguments of the machine to override
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    config.update(kwargs)
+    if tape_file is not None:
+        config["tape_engine"] = ARRAY_TAPE
+    machine = TuringMachine(**config)
+    if tape_file is not None:
+        machine.tape = ArrayTape.load(tape_file)
+    return machine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record and inspect traces of Turing machine runs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='run a machine and record its trace')
+    record.add_argument('machine', help='JSON file with the machine config')
+    record.add_argument('trace', help='trace file to write')
+    record.add_argument('--max-tacts', type=int, default=MAX_ITERATIONS, help='the tacts limit')
+    record.add_argument('--tape-engine', choices=TAPE_ENGINES, default=DICT_TAPE, help='how the tape is stored')
+    record.add_argument('--tape-file', help='file to map the initial tape from, one character per byte (see ArrayTape.load)')
+
+    show = commands.add_parser('show', help='print steps of a trace')
+    show.add_argument('trace', help='trace file to read')
+    show.add_argument('--start', type=int, default=0, help='first tact to print')
+    show.add_argument('--count', type=int, default=20, help='how many tacts to print')
+
+    replayer = commands.add_parser('replay', help='print the tape of a machine after some tacts of its trace')
+    replayer.add_argument('machine', help='JSON file with the machine config')
+    replayer.add_argument('trace', help='trace file to read')
+    replayer.add_argument('--tact', type=int, help='how many tacts to replay, all by default')
+    replayer.add_argument('--tape-file', help='file to map the initial tape from, as for record')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        machine = load_machine(args.machine, args.tape_file, tape_engine=args.tape_engine)
+        with TraceWriter(args.trace, machine) as trace:
+            result = machine.run(max_tacts=args.max_tacts, trace=trace)
+        print("Status:", result["status"])
+        print("Iterations:", result["iterations"])
+    elif args.command == 'show':
+        with TraceReader(args.trace) as trace:
+            print("Tacts:", len(trace))
+            for step in trace[args.start:args.start + args.count]:
+                print("%8d | %6s %s -> %6s %s %s" % (
+                    step.tact, step.curr_state, step.curr_character,
+                    step.next_state, step.next_character, step.move
+                ))
+    else:
+        machine = load_machine(args.machine, args.tape_file)
+        with TraceReader(args.trace) as trace:
+            replay(machine, trace, len(trace) if args.tact is None else args.tact)
+        print("State:", machine.state)
+        machine.print_tape()
+
+
+if __name__ == '__main__':
+    main()
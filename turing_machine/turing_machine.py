@@ -1,8 +1,27 @@
-from typing import Dict
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple
 from turing_machine.constants import LAMBDA, STOP_STATE, MOVE_LEFT, MOVE_NONE, MOVE_RIGHT
-from turing_machine.constants import NORMAL_MODE, BY_STEP_MODE
+from turing_machine.constants import NORMAL_MODE, BY_STEP_MODE, ACCELERATED_MODE
 from turing_machine.constants import SUCCESSFUL_STATUS, MAX_ITERATIONS_REACHED_STATUS, MAX_ITERATIONS
-from turing_machine.tape import Tape
+from turing_machine.constants import DICT_TAPE, CHECKPOINT_TACTS, LOOP_MEMORY, LOOP_DETECTED_STATUS
+from turing_machine.constants import LIMITS_TACTS, TIME_LIMIT_STATUS, TAPE_LIMIT_STATUS, RUN_WINDOW
+from turing_machine.tape import TAPE_ENGINES
+from turing_machine.compiler import CompiledRules, rules_key
+from turing_machine.snapshot import Snapshot
+from turing_machine.loops import LoopDetector
+from turing_machine.profiler import Profiler
+
+
+class Step(NamedTuple):
+    """Information about one tact of a machine run."""
+    curr_state: str
+    next_state: str
+    curr_character: str
+    next_character: str
+    move: str
+    tact: int
 
 
 class TuringMachine:
@@ -15,13 +34,23 @@ class TuringMachine:
     :param str tape: what is on the tape initially
     :param int position: position of the machine's head on the tape (as every cell has integer index)
     :param str initial_state: which state the machine starts from
+    :param str tape_engine: how the tape is stored, one of :data:`~turing_machine.tape.TAPE_ENGINES` names
+    :param bool strict: whether to raise :class:`ValueError` if the rules have any of :meth:`problems`
     """
-    def __init__(self, *, alphabet: str, rules: Dict[str, Dict[str, list]], tape: str = '', position: int = 0, initial_state: str = 'q0'):
+    def __init__(self, *, alphabet: str, rules: Dict[str, Dict[str, list]], tape: str = '', position: int = 0, initial_state: str = 'q0', tape_engine: str = DICT_TAPE, strict: bool = False):
         self.alphabet = alphabet + LAMBDA
         self.rules = rules
-        self.tape = Tape(tape)
+        self.tape_engine = tape_engine
+        self.tape = TAPE_ENGINES[tape_engine](tape)
         self.position = position
+        self.initial_state = initial_state
         self.state = initial_state
+        self.tacts = 0
+        self._compiled = None
+        self._problems = None
+        self.compile()
+        if strict:
+            self.validate()
 
     def __print_line(self):
         """prints horisonatal line of the rules tabel"""
@@ -85,19 +114,71 @@ class TuringMachine:
         :param position: where the head is on the new tape
         """
         self.position = position
-        self.tape = Tape(tape)
+        self.tape = TAPE_ENGINES[self.tape_engine](tape)
+        self.tacts = 0
 
     def get_tape_string(self):
         """Returns the current state of the tape as a string"""
         return str(self.tape)
 
-    def run(self, mode: str = NORMAL_MODE, max_tacts: int = MAX_ITERATIONS) -> dict:
+    def config(self) -> dict:
+        """Returns keyword arguments constructing a machine with the same rules, starting from the initial state on an empty tape."""
+        return {
+            "alphabet": self.alphabet[:-1],
+            "rules": self.rules,
+            "initial_state": self.initial_state,
+            "tape_engine": self.tape_engine
+        }
+
+    def fingerprint(self) -> tuple:
+        """Returns hashable fingerprint of the configuration: state, head position and :meth:`~turing_machine.tape.Tape.fingerprint` of the tape.
+
+        It takes O(1) time (after the first call for the tape), equal
+        configurations have equal fingerprints and different ones almost
+        certainly don't, also in different processes.
+        """
+        return self.state, self.position, self.tape.fingerprint()
+
+    def snapshot(self) -> Snapshot:
+        """Returns the current configuration of the machine."""
+        offset, _ = self.tape.bounds
+        return Snapshot(self.state, self.position, offset, str(self.tape), self.tacts)
+
+    def restore(self, snapshot: Snapshot):
+        """Puts the machine into the configuration from the snapshot."""
+        self.tape = TAPE_ENGINES[self.tape_engine](snapshot.tape, snapshot.offset)
+        self.position = snapshot.position
+        self.state = snapshot.state
+        self.tacts = snapshot.tacts
+
+    def run(self, mode: str = NORMAL_MODE, max_tacts: int = MAX_ITERATIONS, trace=None, checkpoint: str = None, checkpoint_tacts: int = CHECKPOINT_TACTS, detect_loops: bool = False, loop_memory: int = LOOP_MEMORY, profile=False, deadline: float = None, max_cells: int = None, limits_tacts: int = LIMITS_TACTS, history=None) -> dict:
         """Emulate the Turing machine.
 
+        To continue a run from a checkpoint, :meth:`restore` the machine from
+        ``Snapshot.load(checkpoint)`` and run it for the rest of tacts.
+
+        Tracing, loop detection, profiling and history make the machine run
+        step by step, without compiled rules or acceleration.
+
+        The deadline and the tape cells budget are checked before the run and
+        then every `limits_tacts` tacts, so the run may overshoot them by that
+        many tacts (and tape cells).
+
         :param mode: whether to include result of every step in return
+        :param max_tacts: the tacts limit
+        :param trace: where to write every step, e.g. :class:`~turing_machine.trace.TraceWriter`
+        :param checkpoint: file to save :meth:`snapshot` to periodically and at the end of the run
+        :param checkpoint_tacts: how many tacts to do between checkpoints
+        :param detect_loops: whether to stop when the machine comes to the same configuration twice
+        :param loop_memory: how many configuration fingerprints to keep when looking for loops
+        :param profile: whether to collect statistics of the run, or a function to call with them
+        :param deadline: :func:`time.monotonic` time to stop the run at
+        :param max_cells: how long the written part of the tape may get
+        :param limits_tacts: how many tacts to do between checks of `deadline` and `max_cells`
+        :param history: :class:`~turing_machine.history.History` to record every tact to
         :returns: dictionary with fields:
 
-            :status: whether the machine stoped by itself (successfully) or because of tacts limit
+            :status: whether the machine stoped by itself (successfully), because of tacts, time or tape limit or because it loops
 
             :result: what is written on the tape as result
 
@@ -106,41 +187,363 @@ class TuringMachine:
             :head_position: where the head is on the tape
 
             :steps: list of intemideate information for every step, included only for "by step" mode
+
+            :loop_start: the tact the loop starts from, included only if a loop is detected
+
+            :loop_period: how many tacts one pass of the loop takes, included only if a loop is detected
+
+            :profile: statistics of the run (see :meth:`~turing_machine.profiler.Profiler.as_dict`), included only if profiled
         """
-        tacts = 0
         steps = []
+        for line in self.iter_run(
+            mode, max_tacts, trace=trace, checkpoint=checkpoint, checkpoint_tacts=checkpoint_tacts,
+            detect_loops=detect_loops, loop_memory=loop_memory, profile=profile,
+            deadline=deadline, max_cells=max_cells, limits_tacts=limits_tacts, history=history
+        ):
+            steps.extend(line.get("steps", ()))
+        result = line["result"]
+        if mode == BY_STEP_MODE:
+            result["steps"] = steps
+        return result
+
+    def iter_run(self, mode: str = NORMAL_MODE, max_tacts: int = MAX_ITERATIONS, trace=None, checkpoint: str = None, checkpoint_tacts: int = CHECKPOINT_TACTS, detect_loops: bool = False, loop_memory: int = LOOP_MEMORY, profile=False, deadline: float = None, max_cells: int = None, limits_tacts: int = LIMITS_TACTS, history=None) -> Iterator[dict]:
+        """Emulate the Turing machine as :meth:`run` does, reporting the progress.
 
+        In "by step" mode the run pauses every `limits_tacts` tacts at least,
+        and ``{"steps": [...]}`` with steps done since the previous pause is
+        yielded at every pause. The last item is ``{"result": {...}}`` with
+        the result of :meth:`run`, excluding steps.
+
+        :returns: iterator over the steps and the result of the run
+        """
+        chunk = max_tacts if checkpoint is None else checkpoint_tacts
+        if deadline is not None or max_cells is not None or mode == BY_STEP_MODE:
+            chunk = min(chunk, limits_tacts)
+        limit = None
+        tacts = 0
+        steps = [] if mode == BY_STEP_MODE else None
+        detector = LoopDetector(self, loop_memory) if detect_loops else None
+        profiler = Profiler(self) if profile else None
+
+        observers = []
+        if trace is not None:
+            observers.append(trace.write)
+        if steps is not None:
+            observers.append(lambda step: steps.append(step._asdict()))
+        if profiler is not None:
+            profiler.phase("compile")
+            self.compile()
+            profiler.phase("run")
+            observers.append(profiler.step)
+        if detector is not None:
+            observers.append(lambda step: detector.step())
+        if history is not None:
+            observers.append(history.step)
+
+        def store(lo: int, hi: int) -> bool:
+            if checkpoint is not None:
+                return True
+            if max_cells is None:
+                return False
+            left, right = self.tape.bounds
+            return max(right, hi) - min(left, lo) > max_cells
+
+        limit = self.__limit(deadline, max_cells)
+        if limit is None:
+            chunks = self.__execute(mode, max_tacts, chunk, store, observers)
+            try:
+                for tacts in chunks:
+                    if checkpoint is not None:
+                        self.snapshot().save(checkpoint)
+                    if steps:
+                        yield {"steps": list(steps)}
+                        steps.clear()
+                    if self.state == STOP_STATE or tacts >= max_tacts or detector is not None and detector.period:
+                        break
+                    limit = self.__limit(deadline, max_cells)
+                    if limit is not None:
+                        break
+            finally:
+                chunks.close()
+
+        if profiler is not None:
+            profiler.phase("result")
+        result = self.__result(tacts, max_tacts)
+        if limit is not None:
+            result["status"] = limit
+        if detector is not None and detector.period:
+            result["status"] = LOOP_DETECTED_STATUS
+            result["loop_start"] = detector.loop_start()
+            result["loop_period"] = detector.period
+        if profiler is not None:
+            profiler.phase(None)
+            result["profile"] = profiler.as_dict()
+            if callable(profile):
+                profile(result["profile"])
+        yield {"result": result}
+
+    def __limit(self, deadline: float, max_cells: int) -> str:
+        """Returns status of the limit of :meth:`run` reached, ``None`` if there is none."""
+        if deadline is not None and time.monotonic() >= deadline:
+            return TIME_LIMIT_STATUS
+        if max_cells is not None:
+            left, right = self.tape.bounds
+            if right - left > max_cells:
+                return TAPE_LIMIT_STATUS
+        return None
+
+    def __execute(self, mode: str, max_tacts: int, chunk: int, store: Callable[[int, int], bool], observers: list) -> Iterator[int]:
+        """Runs the machine for at most `max_tacts` tacts pausing every `chunk` tacts.
+
+        The run goes on when the iteration does, the machine is up to date
+        when it ends or is closed.
+
+        :param store: function telling at a pause whether the tape has to be up to date too, called with bounds of the cells which may be not
+        :param observers: functions to call with :class:`Step` of every tact, the run stops when one returns true
+        :returns: iterator over number of tacts done by every pause and by the end of the run
+        """
+        if not observers:
+            return self.__run_compiled(max_tacts, chunk, store, mode == ACCELERATED_MODE)
+        return self.__run_stepped(max_tacts, chunk, observers)
+
+    def __run_stepped(self, max_tacts: int, chunk: int, observers: list) -> Iterator[int]:
+        """Runs the machine by :meth:`iter_steps` calling observers, see :meth:`__execute`."""
+        tacts = 0
+        for step in self.iter_steps(max_tacts):
+            tacts += 1
+            if any([observe(step) for observe in observers]):
+                break
+            if tacts % chunk == 0:
+                yield tacts
+        yield tacts
+
+    def iter_steps(self, max_tacts: int = MAX_ITERATIONS) -> Iterator[Step]:
+        """Emulate the Turing machine step by step.
+
+        The machine is advanced lazily, so when the iteration stops early,
+        the machine is left right after the last yielded step.
+
+        :param max_tacts: the tacts limit
+        :returns: iterator over :class:`Step` of every tact
+        """
+        tacts = 0
         while self.state != STOP_STATE and tacts < max_tacts:
             c = self.tape[self.position]
             c_next, move, q_next = self.rules[self.state][c]
             self.tape[self.position] = c_next
 
-            if mode == BY_STEP_MODE:
-                steps.append({
-                    "curr_state": self.state,
-                    "next_state": q_next,
-                    "curr_character": c,
-                    "next_character": c_next,
-                    "move": move,
-                    "tact": tacts
-                })
-
             if move == MOVE_RIGHT:
                 self.position += 1
             elif move == MOVE_LEFT:
                 self.position -= 1
 
-            tacts += 1
+            q = self.state
             self.state = q_next
+            self.tacts += 1
+            yield Step(q, q_next, c, c_next, move, tacts)
+            tacts += 1
+
+    def run_batch(self, inputs: Iterable[str], mode: str = NORMAL_MODE, max_tacts: int = MAX_ITERATIONS, workers: int = None, chunksize: int = 1) -> Iterator[dict]:
+        """Run the machine on many input tapes in a pool of processes.
+
+        The rules are sent to every worker process once. Every input is run
+        from the initial state with the head at cell 0, the machine itself is
+        not changed.
+
+        :param inputs: strings written on the tape initially
+        :param mode: mode of every run, as for :meth:`run`
+        :param max_tacts: tacts limit of every run
+        :param workers: number of worker processes, by default number of processors
+        :param chunksize: how many inputs are sent to a worker at once
+        :returns: iterator over :meth:`run` results in the order of inputs
+        """
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(self.config(),)) as executor:
+            yield from executor.map(_run_batch_input, inputs, repeat(mode), repeat(max_tacts), chunksize=chunksize)
 
-        result = {
+    def __result(self, tacts: int, max_tacts: int) -> dict:
+        """Returns dictionary describing the machine after run of `tacts` tacts."""
+        return {
             "status": SUCCESSFUL_STATUS if tacts < max_tacts else MAX_ITERATIONS_REACHED_STATUS,
             "result": self.get_tape_string(),
             "iterations": tacts,
             "head_position": self.position
         }
 
-        if mode == BY_STEP_MODE:
-            result["steps"] = steps
+    def compile(self) -> CompiledRules:
+        """Returns the rules compiled to integer tables.
 
-        return result
+        The compiled rules are cached until the alphabet or the rules change.
+        """
+        key = rules_key(self.alphabet, self.rules)
+        if self._compiled is None or self._compiled.key != key:
+            self._compiled = CompiledRules(self.alphabet, self.rules, key)
+            self._problems = None
+        return self._compiled
+
+    def problems(self) -> list:
+        """Returns descriptions of what is wrong with the rules, see :meth:`~turing_machine.compiler.CompiledRules.problems`.
+
+        They are found once and cached together with the compiled rules.
+        """
+        compiled = self.compile()
+        if self._problems is None or self._problems[0] != self.initial_state:
+            self._problems = self.initial_state, tuple(compiled.problems(self.initial_state))
+        return list(self._problems[1])
+
+    def validate(self):
+        """Checks the rules to be complete and consistent.
+
+        :raises ValueError: listing all the :meth:`problems` if there are any
+        """
+        problems = self.problems()
+        if problems:
+            raise ValueError('invalid rules: ' + '; '.join(problems))
+
+    def __run_compiled(self, max_tacts: int, chunk: int, store: Callable[[int, int], bool], accelerate: bool = False) -> Iterator[int]:
+        """Runs the machine on compiled rules, see :meth:`__execute`.
+
+        A window of the tape around the head is loaded into a buffer of
+        character codes, so every tact is a few integer operations. The window
+        grows twice whenever the head leaves it and is kept between pauses. In
+        the end only the cells the head could reach are written back, and only
+        those whose character has changed, so the run takes O(`max_tacts`) time
+        whatever the tape size.
+
+        :param store: see :meth:`__execute`, otherwise only the head and the state are up to date at a pause
+        :param accelerate: whether to do sweeps (see :class:`CompiledRules`) in one operation
+        """
+        if self.state == STOP_STATE or max_tacts <= 0:
+            yield 0
+            return
+
+        compiled = self.compile()
+        if self.state not in compiled.state_codes:
+            raise KeyError(self.state)
+
+        width, table, stop = compiled.width, compiled.table, compiled.stop_row
+        sweeps = compiled.sweeps if accelerate else None
+
+        first = self.position
+        radius = min(max_tacts, RUN_WINDOW)
+        lo = first - radius
+        buffer = self.__load(lo, first + radius + 1, compiled, sweeps is not None)
+
+        row = compiled.state_codes[self.state] * width
+        position = first - lo
+        size = len(buffer)
+        tacts = stored = counted = 0
+        pause = min(chunk, max_tacts)
+        entry = True
+
+        try:
+            while True:
+                while row != stop and tacts < pause:
+                    if not 0 <= position < size:
+                        extra = min(size, max_tacts - tacts)
+                        if position < 0:
+                            buffer[:0] = self.__load(lo - extra, lo, compiled, sweeps is not None)
+                            position += extra
+                            lo -= extra
+                        else:
+                            buffer.extend(self.__load(lo + size, lo + size + extra, compiled, sweeps is not None))
+                        size += extra
+
+                    index = row + buffer[position]
+                    entry = table[index]
+                    if entry is None:
+                        break
+
+                    if sweeps is not None and sweeps[index] is not None:
+                        delta, members, translation = sweeps[index]
+                        length = self.__sweep_length(buffer, position, delta, members, pause - tacts)
+                        start = position if delta > 0 else position - length + 1
+                        buffer[start:start + length] = buffer[start:start + length].translate(translation)
+                        position += delta * length
+                        tacts += length
+                        continue
+
+                    buffer[position], delta, row = entry
+                    position += delta
+                    tacts += 1
+                if entry is None:
+                    break
+
+                self.position = lo + position
+                self.state = compiled.states[row // width]
+                self.tacts += tacts - counted
+                counted = tacts
+                reach = tacts - stored
+                if store(max(first - reach, lo), min(first + reach + 1, lo + size)):
+                    self.__store(buffer, lo, first, tacts - stored, compiled)
+                    first, stored = self.position, tacts
+                yield tacts
+                if row == stop or tacts >= max_tacts:
+                    return
+                pause = min(pause + chunk, max_tacts)
+        finally:
+            self.__store(buffer, lo, first, tacts - stored, compiled)
+            self.position = lo + position
+            self.state = compiled.states[row // width]
+            self.tacts += tacts - counted
+
+        if self.state not in self.rules:
+            raise KeyError(self.state)
+        raise KeyError(self.tape[self.position])
+
+    def __load(self, lo: int, hi: int, compiled: CompiledRules, as_bytes: bool):
+        """Returns codes of the characters of the tape cells from `lo` to `hi` (excluded), as a bytearray or a list."""
+        codes, unknown_code = compiled.symbol_codes, compiled.unknown_code
+        buffer = [codes.get(c, unknown_code) for c in self.tape.slice(lo, hi)]
+        return bytearray(buffer) if as_bytes else buffer
+
+    def __store(self, buffer, lo: int, first: int, reach: int, compiled: CompiledRules):
+        """Writes the cells at most `reach` cells from `first` of the buffer loaded from cell `lo` back to the tape, those which have changed."""
+        start, end = max(first - reach, lo), min(first + reach + 1, lo + len(buffer))
+        if start >= end:
+            return
+        tape = self.tape
+        characters = compiled.symbols + (None,)
+        written = map(characters.__getitem__, buffer[start - lo:end - lo])
+        for i, c, old in zip(range(start, end), written, tape.slice(start, end)):
+            if c != old and c is not None:
+                tape[i] = c
+
+    @staticmethod
+    def __sweep_length(buffer: bytearray, position: int, delta: int, members: bytes, limit: int) -> int:
+        """Returns how many cells from `position` in direction `delta` hold one of `members`, at most `limit`.
+
+        The buffer is scanned by C-level stripping of slices growing twice
+        at a time, so the cost is proportional to the returned length.
+        """
+        length = 0
+        chunk = 16
+        while True:
+            count = min(chunk, limit - length)
+            if delta > 0:
+                part = buffer[position + length:position + length + count]
+                rest = len(part.lstrip(members))
+            else:
+                end = position - length + 1
+                part = buffer[max(end - count, 0):end]
+                rest = len(part.rstrip(members))
+            length += len(part) - rest
+            if rest or len(part) < count or length == limit:
+                return length
+            chunk *= 2
+
+
+_batch_machine = None
+"""The machine of a batch worker process, see :meth:`TuringMachine.run_batch`."""
+
+
+def _init_batch_worker(config: dict):
+    """Creates the machine of a batch worker process."""
+    global _batch_machine
+    _batch_machine = TuringMachine(**config)
+
+
+def _run_batch_input(tape: str, mode: str, max_tacts: int) -> dict:
+    """Runs the machine of a batch worker process on one input tape."""
+    _batch_machine.set_tape_string(tape)
+    _batch_machine.state = _batch_machine.initial_state
+    return _batch_machine.run(mode, max_tacts)
@@ -1,19 +1,50 @@
 import os
 import json
+import time
+import argparse
+import threading
+import multiprocessing
+import queue
+import signal
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import hashlib
+import html
 import gettext
 
 from flask import Flask
-from flask import request, redirect, send_from_directory, url_for
+from flask import request, redirect, send_from_directory, url_for, Response, stream_with_context
 from werkzeug.utils import secure_filename
 
-from turing_machine.constants import BY_STEP_MODE
+from turing_machine.constants import MAX_ITERATIONS, BY_STEP_MODE, TIME_LIMIT_STATUS
 from turing_machine.turing_machine import TuringMachine
+from turing_machine.cache import ResultCache, machine_key
 
 
 app = Flask(__name__)
+app.config['MAX_TACTS'] = MAX_ITERATIONS  # лимит тактов одного запуска
+app.config['RUN_TIMEOUT'] = 10.0  # лимит времени одного запуска в секундах
+app.config['MAX_CELLS'] = 1000000  # лимит длины записанной части ленты
 
+STEPS_CHUNK = 500
+"""How many steps are sent to the web viewer at once."""
+RESULT_CACHE_SIZE = 64 * 1024 * 1024
+"""How many characters of rendered pages and streamed runs are cached at most."""
 
+results = ResultCache(RESULT_CACHE_SIZE)
+"""Rendered pages and streamed runs by hash of the machine, see :func:`~turing_machine.cache.machine_key`."""
+pool = None
+"""Worker processes running machines in production mode, ``None`` to run them in the serving thread."""
+pool_queue = 0
+"""How many different runs may wait for or use the worker processes at once."""
+manager = None
+"""Manager of the queues passing lines of runs from the worker processes."""
+pending = {}
+"""Runs in the worker processes by cache key (see :class:`PendingRun`), shared by concurrent requests of the same run."""
+pending_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
 def get_md5(filename):
     with open(filename, 'rb') as f:
         return hashlib.md5(f.read()).hexdigest()
@@ -58,13 +89,160 @@ def index():
     '''.format(style=get_md5(app.config["CSS_FOLDER"] + "/styles.css"))
 
 
+def load_config(filename):
+    """Returns config of the uploaded machine (keyword arguments of :class:`TuringMachine`)."""
+    with open(app.config['UPLOAD_FOLDER'] + '/' + filename, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def stream_run(machine, max_tacts=MAX_ITERATIONS, chunk=STEPS_CHUNK, timeout=None, max_cells=None):
+    """Runs the machine by :meth:`TuringMachine.iter_run` in "by step" mode, yields NDJSON lines by chunks of tacts.
+
+    Every line but the last is ``{"steps": [...]}`` with steps of a chunk as
+    in the "by step" mode of :meth:`TuringMachine.run`. The last line is
+    ``{"result": {...}}`` with the result of the whole run, including profile
+    and excluding steps, or ``{"error": ...}`` if the run has failed.
+
+    :param timeout: seconds to stop the run after, checked between chunks
+    :param max_cells: how long the written part of the tape may get, checked between chunks
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        for line in machine.iter_run(BY_STEP_MODE, max_tacts, profile=True, deadline=deadline, max_cells=max_cells, limits_tacts=chunk):
+            yield json.dumps(line, ensure_ascii=False) + '\n'
+    except Exception:
+        app.logger.exception('the run has failed')
+        yield json.dumps({"error": "the run has failed"}) + '\n'
+
+
+def run_lines(config, max_tacts, timeout, max_cells, lines):
+    """Runs the machine in a worker process, puts the lines of :func:`stream_run` to the `lines` queue and ``None`` after them."""
+    try:
+        for line in stream_run(TuringMachine(**config), max_tacts, timeout=timeout, max_cells=max_cells):
+            lines.put(line)
+    finally:
+        lines.put(None)
+
+
+def cacheable(lines):
+    """Returns whether the lines are a whole run of :func:`stream_run` which hasn't timed out."""
+    if not lines:
+        return False
+    last = json.loads(lines[-1])
+    return "result" in last and last["result"]["status"] != TIME_LIMIT_STATUS
+
+
+def cache_lines(key, lines):
+    """Yields the lines, caches them for the key once all of them are yielded, unless the run has timed out."""
+    collected = []
+    for line in lines:
+        collected.append(line)
+        yield line
+    if cacheable(collected):
+        results.put(key, collected)
+
+
+class PendingRun:
+    """A run in the worker processes, streamed to any number of requests while it goes on.
+
+    A thread collects lines the worker puts to the queue. Once the run is
+    over, the lines are cached and the run is removed from :data:`pending`.
+    A run failed in the worker ends with an ``{"error": ...}`` line.
+    """
+    poll_seconds = 0.1
+    """How often the collecting thread checks whether the worker has failed without finishing the lines."""
+
+    def __init__(self, key, future, lines):
+        self.key = key
+        self.future = future
+        self.queue = lines
+        self.lines = []
+        self.done = False
+        self.condition = threading.Condition()
+        threading.Thread(target=self.__collect, daemon=True).start()
+
+    def __collect(self):
+        """Collects lines of the run till it is over."""
+        while True:
+            try:
+                line = self.queue.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                if self.future.done():
+                    break
+                continue
+            if line is None:
+                break
+            with self.condition:
+                self.lines.append(line)
+                self.condition.notify_all()
+
+        if self.future.cancelled() or self.future.exception() is not None:
+            with self.condition:
+                self.lines.append(json.dumps({"error": "the run has failed"}) + '\n')
+        elif cacheable(self.lines):
+            results.put(self.key, self.lines)
+        with pending_lock:
+            del pending[self.key]
+        with self.condition:
+            self.done = True
+            self.condition.notify_all()
+
+    def __iter__(self):
+        """Yields lines of the run, waiting for the worker to produce them."""
+        sent = 0
+        while True:
+            with self.condition:
+                while sent == len(self.lines) and not self.done:
+                    self.condition.wait()
+                lines = self.lines[sent:]
+            if not lines:
+                return
+            sent += len(lines)
+            yield from lines
+
+
+def submit_run(key, config, max_tacts, timeout, max_cells):
+    """Returns :class:`PendingRun` of the run in the worker processes, ``None`` if too many runs are waiting."""
+    with pending_lock:
+        run = pending.get(key)
+        if run is None and len(pending) < pool_queue:
+            lines = manager.Queue()
+            future = pool.submit(run_lines, config, max_tacts, timeout, max_cells, lines)
+            run = pending[key] = PendingRun(key, future, lines)
+        return run
+
+
+@app.route('/machine-steps/<filename>', methods=['GET'])
+def machine_steps(filename):
+    config = load_config(filename)
+    max_tacts, timeout, max_cells = app.config['MAX_TACTS'], app.config['RUN_TIMEOUT'], app.config['MAX_CELLS']
+    key = 'steps', machine_key(config, max_tacts), max_cells
+    lines = results.get(key)
+    if lines is None and pool is None:
+        lines = cache_lines(key, stream_run(TuringMachine(**config), max_tacts, timeout=timeout, max_cells=max_cells))
+    elif lines is None:
+        run = submit_run(key, config, max_tacts, timeout, max_cells)
+        if run is None:
+            return Response('Too many machines are running, try again later\n', status=503, mimetype='text/plain')
+        lines = iter(run)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+
 @app.route('/view-machine/<filename>', methods=['GET'])
 def view_machine(filename):
-    with open(app.config['UPLOAD_FOLDER'] + '/' + filename, encoding='utf-8') as f:
-        config = json.load(f)
+    config = load_config(filename)
+    key = 'page', filename, machine_key(config, app.config['MAX_TACTS'])
+    page = results.get(key)
+    if page is None:
+        page = render_machine(filename, config)
+        results.put(key, page)
+    return page
 
+
+def render_machine(filename, config):
+    """Returns the viewer page of the machine."""
     turing_machine = TuringMachine(**config)
-    result = turing_machine.run(mode=BY_STEP_MODE)
+    problems = ''.join('<li>%s</li>' % html.escape(problem) for problem in turing_machine.problems())
 
     return '''
     <html>
@@ -80,21 +258,21 @@ def view_machine(filename):
             <div class='margined'><b>Tape: </b><div class='tape' id='tape'></div></div>
             <div class='margined'><b>Alphabet: </b><div class='alphabet' id='alphabet'></div></div>
             <div><b>Rules:</b><br><div><table class='rules' id='rules'></table></div></div>
+            <div class='problems'><ul>{problems}</ul></div>
             <div class='button-box'><button onclick='Run()'>Show solve</button></div>
             <div id='result-box'></div>
         </div>
 
         <script src="/js/turing_machine.js?v={js}"></script>
         <script>
-            let tape = '{tape}'
-            let alphabet = '{alphabet}'
+            let tape = {tape}
+            let alphabet = {alphabet}
             let rules = {rules}
-            let result = {result}
 
             let turing = new TuringMachine(alphabet, tape, rules)
 
             function Run() {{
-                turing.Run(result)
+                turing.Run({steps_url})
             }}
         </script>
     </body>
@@ -103,26 +281,67 @@ def view_machine(filename):
         title=_('Turing machine emulator'),
         style=get_md5(app.config["CSS_FOLDER"] + "/styles.css"),
         js=get_md5(app.config["JS_FOLDER"] + "/turing_machine.js"),
-        tape=config["tape"],
-        alphabet=config["alphabet"],
-        rules=config["rules"],
-        result=result
+        tape=json.dumps(config["tape"]),
+        alphabet=json.dumps(config["alphabet"]),
+        rules=json.dumps(config["rules"]),
+        problems=problems,
+        steps_url=json.dumps(url_for('machine_steps', filename=filename))
     )
 
 
-def main():
+def serve(host, port, threads, workers):
+    """Serves the viewer by a multithreaded WSGI server with debug off, running machines in `workers` processes.
+
+    The server is waitress if it's installed, or werkzeug otherwise. SIGTERM
+    stops it like Ctrl+C, so that the worker processes are shut down too.
+    """
+    global pool, pool_queue, manager
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    with multiprocessing.Manager() as queues, ProcessPoolExecutor(workers) as executor:
+        pool, manager = executor, queues
+        pool_queue = workers * 2
+        try:
+            from waitress import serve as waitress_serve
+        except ImportError:
+            from werkzeug.serving import run_simple
+            run_simple(host, port, app, threaded=True)
+        else:
+            waitress_serve(app, host=host, port=port, threads=threads)
+        finally:
+            pool = manager = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Turing machine web viewer.')
+    parser.add_argument('--host', default="0.0.0.0", help='address to listen on')
+    parser.add_argument('--port', type=int, default=5000, help='port to listen on')
+    parser.add_argument('--upload-folder', help='folder to keep uploaded machines in')
+    parser.add_argument('--production', action='store_true', help='serve by a multithreaded server with debug off and machines run in worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads serving requests in production mode')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='processes running machines in production mode')
+    parser.add_argument('--max-tacts', type=int, default=app.config['MAX_TACTS'], help='tacts limit of a run')
+    parser.add_argument('--timeout', type=float, default=app.config['RUN_TIMEOUT'], help='time limit of a run in seconds')
+    parser.add_argument('--max-cells', type=int, default=app.config['MAX_CELLS'], help='limit of the written part of the tape length')
+    args = parser.parse_args(argv)
+
     path = os.path.dirname(__file__)
     gettext.install('turing_machine', localedir=path)
 
-    host = "0.0.0.0"
-    port = 5000
-    debug = True
-
     app.config['JS_FOLDER'] = path + '/web/js'  # папка с js кодом
     app.config['CSS_FOLDER'] = path + '/web/css'  # папка со стилями
-    app.config['UPLOAD_FOLDER'] = path + '/web/upload'  # папка с загрузками
+    app.config['UPLOAD_FOLDER'] = args.upload_folder or path + '/web/upload'  # папка с загрузками
+    app.config['MAX_TACTS'] = args.max_tacts
+    app.config['RUN_TIMEOUT'] = args.timeout
+    app.config['MAX_CELLS'] = args.max_cells
+    get_md5(app.config["CSS_FOLDER"] + "/styles.css")
+    get_md5(app.config["JS_FOLDER"] + "/turing_machine.js")
 
-    app.run(debug=debug, host=host, port=port)
+    if args.production:
+        serve(args.host, args.port, args.threads, args.workers)
+    else:
+        app.run(debug=True, host=args.host, port=args.port)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,4 @@
-function TuringMachine(alphabet = 'abc', tape = 'abacaba', rules = []) {
+function TuringMachine(alphabet = 'abc', tape = 'abacaba', rules = [], hits = {}) {
     this.tapeBox = document.getElementById('tape')
     this.alphabetBox = document.getElementById('alphabet')
     this.rulesBox = document.getElementById('rules')
@@ -7,7 +7,7 @@ function TuringMachine(alphabet = 'abc', tape = 'abacaba', rules = []) {
 
     this.InitAlphabet(alphabet)
     this.InitTape(tape)
-    this.InitRules(rules)
+    this.InitRules(rules, hits)
 }
 
 TuringMachine.prototype.InitTape = function(tape) {
@@ -28,8 +28,16 @@ TuringMachine.prototype.InitAlphabet = function(alphabet) {
     }
 }
 
-TuringMachine.prototype.InitRules = function(rules) {
+TuringMachine.prototype.HeatColor = function(hits, maxHits) {
+    if (!hits)
+        return ''
+
+    return 'rgba(255, 64, 0, ' + (0.1 + 0.6 * hits / maxHits).toFixed(2) + ')'
+}
+
+TuringMachine.prototype.InitRules = function(rules, hits = {}) {
     states = Object.keys(rules)
+    this.ruleCells = {}
 
     let header = document.createElement('tr')
 
@@ -52,6 +60,7 @@ TuringMachine.prototype.InitRules = function(rules) {
         let row = document.createElement('tr')
 
         keys = Object.keys(rules[state])
+        this.ruleCells[state] = {}
 
         let cell = document.createElement('td')
         cell.innerHTML = state
@@ -60,11 +69,30 @@ TuringMachine.prototype.InitRules = function(rules) {
         for (let i = 0; i < keys.length; i++) {
             let cell = document.createElement('td')
             cell.innerHTML = rules[state][keys[i]].join(' ')
+            this.ruleCells[state][keys[i]] = cell
             row.appendChild(cell)
         }
 
         this.rulesBox.appendChild(row)
     }
+
+    this.ShowHeat(hits)
+}
+
+TuringMachine.prototype.ShowHeat = function(hits) {
+    let maxHits = 0
+    for (let state of Object.keys(hits))
+        for (let char of Object.keys(hits[state]))
+            maxHits = Math.max(maxHits, hits[state][char])
+
+    for (let state of Object.keys(this.ruleCells)) {
+        for (let char of Object.keys(this.ruleCells[state])) {
+            let count = state in hits ? hits[state][char] || 0 : 0
+            let cell = this.ruleCells[state][char]
+            cell.title = count + ' hits'
+            cell.style.backgroundColor = this.HeatColor(count, maxHits)
+        }
+    }
 }
 
 TuringMachine.prototype.AddRowWithValues = function(table, values, elem='td') {
@@ -79,28 +107,78 @@ TuringMachine.prototype.AddRowWithValues = function(table, values, elem='td') {
     table.appendChild(row)
 }
 
-TuringMachine.prototype.Run = function(result) {
-    this.resultBox.innerHTML = ''
-    this.resultBox.innerHTML += '<b>Result: </b>' + result["result"] + '<br>'
-    this.resultBox.innerHTML += '<b>Iterations: </b>' + result["iterations"] + '<br>'
-    this.resultBox.innerHTML += '<b>Status: </b>' + result["status"] + '<br>'
-    this.resultBox.innerHTML += '<b>Head position: </b>' + result["head_position"] + '<br><br>'
+TuringMachine.prototype.ShowResult = function(box, result) {
+    box.innerHTML = ''
+    box.innerHTML += '<b>Result: </b>' + result["result"] + '<br>'
+    box.innerHTML += '<b>Iterations: </b>' + result["iterations"] + '<br>'
+    box.innerHTML += '<b>Status: </b>' + result["status"] + '<br>'
+    box.innerHTML += '<b>Head position: </b>' + result["head_position"] + '<br><br>'
 
-    this.resultBox.innerHTML += '<b>Steps:</b><br>'
+    if ("profile" in result)
+        this.ShowHeat(result["profile"]["rules"])
+}
 
-    let table = document.createElement('table')
-    this.AddRowWithValues(table, ['curr state', 'curr char', 'next state', 'next char', 'move'], 'th')
+TuringMachine.prototype.ShowSteps = function(table, steps) {
+    let rows = document.createDocumentFragment()
 
-    for (let i = 0; i < result["steps"].length; i++) {
-        let step = result["steps"][i]
+    for (let i = 0; i < steps.length; i++) {
+        let step = steps[i]
         let curr_state = step["curr_state"]
         let next_state = step["next_state"]
         let curr_char = step["curr_character"]
         let next_char = step["next_character"]
         let move = step["move"]
 
-        this.AddRowWithValues(table, [curr_state, curr_char, next_state, next_char, move])
+        this.AddRowWithValues(rows, [curr_state, curr_char, next_state, next_char, move])
     }
 
+    table.appendChild(rows)
+}
+
+TuringMachine.prototype.Run = async function(url) {
+    this.resultBox.innerHTML = ''
+
+    let info = document.createElement('div')
+    info.innerHTML = '<b>Running...</b><br><br>'
+    this.resultBox.appendChild(info)
+
+    let title = document.createElement('div')
+    title.innerHTML = '<b>Steps:</b>'
+    this.resultBox.appendChild(title)
+
+    let table = document.createElement('table')
+    this.AddRowWithValues(table, ['curr state', 'curr char', 'next state', 'next char', 'move'], 'th')
     this.resultBox.appendChild(table)
+
+    let response = await fetch(url)
+    if (!response.ok) {
+        info.innerHTML = '<b>Error:</b> '
+        info.appendChild(document.createTextNode(await response.text()))
+        return
+    }
+
+    let reader = response.body.getReader()
+    let decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+        let chunk = await reader.read()
+        if (chunk.done)
+            break
+
+        buffer += decoder.decode(chunk.value, {stream: true})
+        let lines = buffer.split('\n')
+        buffer = lines.pop()
+
+        for (let line of lines) {
+            let message = JSON.parse(line)
+
+            if ("steps" in message)
+                this.ShowSteps(table, message["steps"])
+            else if ("error" in message)
+                info.innerHTML = '<b>Error:</b> ' + message["error"]
+            else
+                this.ShowResult(info, message["result"])
+        }
+    }
 }